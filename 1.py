@@ -1,38 +1,116 @@
 import os
+import tarfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import certifi
+import urllib3
 from minio import Minio
 from dotenv import load_dotenv
 
+try:
+    import zstandard
+except ImportError:  # only needed when the bucket holds small-file batches
+    zstandard = None
+
 # Load environment variables from .env
 load_dotenv()
 
-# Setup MinIO client
+bucket_name = os.getenv("BUCKET_NAME")  # passed dynamically by orchestrator
+download_dir = "./"
+download_concurrency = int(os.getenv("DOWNLOAD_CONCURRENCY", 16))
+
+# Objects above this size are fetched as parallel ranged GETs
+LARGE_OBJECT_THRESHOLD = 64 * 1024 * 1024
+RANGE_CHUNK_SIZE = 16 * 1024 * 1024
+
+# Directories of small files that client.py uploaded as one tar.zst object (MINIO_BATCH_SMALL_FILES)
+SMALL_FILE_BATCH_NAME = "_small_files.tar.zst"
+TAR_EXTRACT_OPTIONS = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+
+# Caps in-flight ranged GETs across all large objects
+range_slots = threading.BoundedSemaphore(download_concurrency)
+
+# Setup MinIO client. Same settings as the SDK's default pool, but with a connection for every
+# download thread plus every ranged GET (the default keeps 10, so extra threads would reconnect)
 minio_client = Minio(
     os.getenv("MINIO_ENDPOINT"),
     access_key=os.getenv("MINIO_ACCESS_KEY"),
     secret_key=os.getenv("MINIO_SECRET_KEY"),
-    secure=os.getenv("MINIO_SECURE") == "True"
+    secure=os.getenv("MINIO_SECURE") == "True",
+    http_client=urllib3.PoolManager(
+        timeout=urllib3.Timeout(connect=300, read=300),
+        maxsize=2 * download_concurrency,
+        cert_reqs="CERT_REQUIRED",
+        ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+        retries=urllib3.Retry(total=5, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504])
+    )
 )
 
-bucket_name = os.getenv("BUCKET_NAME")  # passed dynamically by orchestrator
-download_dir = "./"
-
 # Create local download directory if it doesn't exist
 os.makedirs(download_dir, exist_ok=True)
 
-# List and download all objects
-objects = minio_client.list_objects(bucket_name, recursive=True)
+def fetch_range(object_path, fd, offset, length):
+    """Fetch one byte range of an object and write it at the same offset."""
+    with range_slots:
+        response = minio_client.get_object(bucket_name, object_path, offset=offset, length=length)
+        try:
+            data = response.read()
+        finally:
+            response.close()
+            response.release_conn()
+    os.pwrite(fd, data, offset)
 
-print(f"Downloading objects from bucket '{bucket_name}'...\n")
+def download_large_object(object_path, size, local_file_path):
+    """Download a large object as concurrent ranged GETs into a preallocated file."""
+    fd = os.open(local_file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        if hasattr(os, "posix_fallocate"):
+            os.posix_fallocate(fd, 0, size)
+        else:
+            os.ftruncate(fd, size)
+        with ThreadPoolExecutor(max_workers=download_concurrency) as executor:
+            futures = [
+                executor.submit(fetch_range, object_path, fd, offset, min(RANGE_CHUNK_SIZE, size - offset))
+                for offset in range(0, size, RANGE_CHUNK_SIZE)
+            ]
+            for future in futures:
+                future.result()
+    finally:
+        os.close(fd)
 
-for obj in objects:
-    object_path = obj.object_name
+def unpack_small_file_batch(archive_path):
+    """Unpack a small-file batch into its own directory and remove the archive."""
+    if zstandard is None:
+        raise RuntimeError(f"zstandard is required to unpack {archive_path}")
+    with open(archive_path, "rb") as raw, \
+            zstandard.ZstdDecompressor().stream_reader(raw) as stream, \
+            tarfile.open(fileobj=stream, mode="r|") as tar:
+        tar.extractall(path=os.path.dirname(archive_path), **TAR_EXTRACT_OPTIONS)
+    os.remove(archive_path)
+
+def download_object(obj):
+    """Download a single object into download_dir, keeping its relative path."""
+    object_path, size = obj
     local_file_path = os.path.join(download_dir, object_path)
+    if size and size > LARGE_OBJECT_THRESHOLD:
+        download_large_object(object_path, size, local_file_path)
+    else:
+        minio_client.fget_object(bucket_name, object_path, local_file_path)
+    if os.path.basename(object_path) == SMALL_FILE_BATCH_NAME:
+        unpack_small_file_batch(local_file_path)
+    print(f"Downloaded: {object_path} -> {local_file_path}")
 
-    # Create local subdirectories if needed
-    os.makedirs(os.path.dirname(local_file_path), exist_ok=True)
+# List all objects up front so directories can be created once
+objects = [(obj.object_name, obj.size) for obj in minio_client.list_objects(bucket_name, recursive=True)]
 
-    # Download the object
-    minio_client.fget_object(bucket_name, object_path, local_file_path)
-    print(f"Downloaded: {object_path} -> {local_file_path}")
+print(f"Downloading {len(objects)} objects from bucket '{bucket_name}'...\n")
+
+# Create local subdirectories if needed
+for local_dir in {os.path.dirname(os.path.join(download_dir, name)) for name, _ in objects}:
+    os.makedirs(local_dir, exist_ok=True)
+
+# Download the objects concurrently; the client is thread-safe
+with ThreadPoolExecutor(max_workers=download_concurrency) as executor:
+    list(executor.map(download_object, objects))
 
 print("\n✅ All files downloaded successfully.")
@@ -1,13 +1,53 @@
 import os
 import json
+import logging
 import re
 import time
 import shutil
-import glob
-from pymongo import MongoClient
+import functools
+import mmap
+import contextlib
+import orjson
+from concurrent.futures import ProcessPoolExecutor
+from pymongo import WriteConcern
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 from dotenv import load_dotenv
-from urllib.parse import quote_plus
+from mongo_conn import build_mongo_uri, get_mongo_client
+
+# Full document dumps are debug output; enable with DEBUG=true
+logger = logging.getLogger(__name__)
+
+# Precompiled patterns used by the extraction functions below
+_INSTALL_METHOD_RE = re.compile(rb'"update_type"\s*:\s*"([^"]+)"')
+_REWRITE_RE = re.compile(rb'"rewrite"\s*:\s*(true|false)')
+_DOWNGRADE_RE = re.compile(rb'"downgrade"\s*:\s*(true|false)')
+_BASELINE_RE = re.compile(r'The selected baseline (.*?) is absaroka compliant = true')
+_SUT_SECTION_RE = re.compile(r'\[(.*?)\]')
+_SUT_FIELDS_RE = re.compile(
+    r'Mode:\s*(?P<mode>.*?)(?:Service\s*)?State:\s*(?P<state>[^V]*?)Version:\s*(?P<version>[^T]*?)Type:'
+)
+_SUT_MODE_RE = re.compile(r'Mode:\s*(.*?)(?:Service\s*)?State:')
+_SUT_STATE_RE = re.compile(r'State:\s*([^V]*?)Version:')
+_SUT_VERSION_RE = re.compile(r'Version:\s*([^T]*?)Type:')
+_FDBS_RE = re.compile(r'FirmwareDriverBaselineSettings on server .*? is (.*)')
+_FW_LINE_RE = re.compile(
+    rb'(?P<baseline>The selected baseline )'
+    rb'|(?P<sut>Successfully got SUT status from server via RIS for )'
+)
+_FDBS_MARKER = b'FirmwareDriverBaselineSettings on server '
+_STATE_JSON_RE = re.compile(r'"State"\s*:\s*"([^"]*)"')
+_MODEL_NUMBER_RE = re.compile(rb'^[ \t]*MODEL_NUMBER =[ \t]*(.*?)\s*$', re.M)
+_UUID_JSON_RE = re.compile(r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\.json$')
+
+# iLO model name -> server generation
+_ILO_GENERATIONS = {
+    "iLO 5": "Gen10",
+    "iLO 6": "Gen11",
+    "iLO 7": "Gen12"
+}
+
+# Shared decoder for JSON objects embedded in log text
+_JSON_DECODER = json.JSONDecoder()
 
 def initialize_dictionary():
     """Initialize the dictionary structure to store all information."""
@@ -48,7 +88,7 @@ def initialize_dictionary():
 def read_version_file(file_path):
     """Read and extract version from the specified file."""
     try:
-        with open(file_path, 'r') as file:
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as file:
             content = file.read().strip()
             return content
     except Exception as e:
@@ -58,67 +98,93 @@ def read_version_file(file_path):
 def read_model_number(file_path):
     """Read and extract MODEL_NUMBER from the appliance.properties file."""
     try:
-        with open(file_path, 'r') as file:
-            for line in file:
-                line = line.strip()
-                if line.startswith("MODEL_NUMBER ="):
-                    model_number = line.split("=", 1)[1].strip()
-                    return model_number
-        return None
+        with open(file_path, 'rb') as file:
+            match = _MODEL_NUMBER_RE.search(file.read())
+        return match.group(1).decode('utf-8', 'replace') if match else None
     except Exception as e:
         print(f"Error reading appliance.properties file: {e}")
         return None
 
-def extract_ilo_model(file_path, info_dict):
-    """Extract iLO model and OS information from installSetLogs.log file."""
+def _decode_json_at(content, start, window=64 * 1024):
+    """Decode the JSON object starting at byte offset start of content.
+
+    The buffer is decoded in a window that doubles until the object fits, so a
+    small object near the start of a large log does not copy the rest of it.
+    """
+    size = len(content)
+    while True:
+        end = min(start + window, size)
+        try:
+            obj, _ = _JSON_DECODER.raw_decode(content[start:end].decode('utf-8', 'replace'))
+            return obj
+        except json.JSONDecodeError:
+            if end == size:
+                raise
+            window *= 2
+
+def _server_generation(ilo_model):
+    """Return the server generation for an iLO model name, or None if unknown."""
+    server_gen = _ILO_GENERATIONS.get(ilo_model)
+    if server_gen is None:
+        # Names with extra text around the model (e.g. "iLO 6 Standard") fall back to a scan
+        server_gen = next((gen for name, gen in _ILO_GENERATIONS.items() if name in ilo_model), None)
+    return server_gen
+
+def _iter_request_payloads(content):
+    """Yield the stripped bytes after the first "Request = " on each line that has one."""
+    marker = b"Request = "
+    pos = content.find(marker)
+    while pos != -1:
+        line_end = content.find(b"\n", pos)
+        if line_end == -1:
+            line_end = len(content)
+        yield content[pos + len(marker):line_end].strip()
+        pos = content.find(marker, line_end)
+
+def extract_ilo_model(content, info_dict):
+    """Extract iLO model and OS information from installSetLogs.log content (bytes)."""
     try:
-        with open(file_path, 'r') as f:
-            for line in f:
-                if "Request = " in line:
-                    # Extract the JSON string from after "Request = " to the end of line
-                    json_str = line.split("Request = ", 1)[1].strip()
-                    try:
-                        # Parse the JSON string
-                        request_data = json.loads(json_str)
-                        
-                        # Extract OS information
-                        host_os = request_data.get("hapi", {}).get("HostOS", {})
-                        if host_os:
-                            os_name = host_os.get("OsName", "")
-                            os_version = host_os.get("OsVersion", "")
-                            if os_name:
-                                info_dict["Server"]["OS"] = os_name
-                                info_dict["Server"]["OsVersion"] = os_version
-                                print(f"OS Name extracted: {os_name}")
-                                print(f"OS Version extracted: {os_version}")
-                        
-                        # Navigate to fw_inventory array
-                        fw_inventory = request_data.get("hapi", {}).get("server_inventory", {}).get("fw_inventory", [])
-                        
-                        # Find the first item with "Id": "1"
-                        for item in fw_inventory:
-                            if item.get("Id") == "1":
-                                ilo_model = item.get("Name", "")
-                                if ilo_model:
-                                    info_dict["Server"]["iLO Model"] = ilo_model
-                                    
-                                    # Map iLO model to server generation
-                                    if "iLO 5" in ilo_model:
-                                        info_dict["Server"]["Gen"] = "Gen10"
-                                    elif "iLO 6" in ilo_model:
-                                        info_dict["Server"]["Gen"] = "Gen11"
-                                    elif "iLO 7" in ilo_model:
-                                        info_dict["Server"]["Gen"] = "Gen12"
-                                        
-                                    print(f"iLO model extracted: {ilo_model}")
-                                    print(f"Server generation determined: {info_dict['Server']['Gen']}")
-                                    
-                        # If we've reached here, we've processed the JSON regardless of whether we found everything
-                        return True
-                    except json.JSONDecodeError as e:
-                        print(f"Error parsing JSON from installSetLogs.log: {e}")
-                        continue
-        
+        server = info_dict["Server"]
+        for json_str in _iter_request_payloads(content):
+            try:
+                # Parse the JSON string
+                request_data = orjson.loads(json_str)
+                
+                # Extract OS information
+                host_os = request_data.get("hapi", {}).get("HostOS", {})
+                if host_os:
+                    os_name = host_os.get("OsName", "")
+                    os_version = host_os.get("OsVersion", "")
+                    if os_name:
+                        server["OS"] = os_name
+                        server["OsVersion"] = os_version
+                        print(f"OS Name extracted: {os_name}")
+                        print(f"OS Version extracted: {os_version}")
+                
+                # Navigate to fw_inventory array
+                fw_inventory = request_data.get("hapi", {}).get("server_inventory", {}).get("fw_inventory", [])
+                
+                # Find the first item with "Id": "1"
+                for item in fw_inventory:
+                    if item.get("Id") == "1":
+                        ilo_model = item.get("Name", "")
+                        if ilo_model:
+                            server["iLO Model"] = ilo_model
+                            
+                            # Map iLO model to server generation
+                            server_gen = _server_generation(ilo_model)
+                            if server_gen:
+                                server["Gen"] = server_gen
+                                
+                            print(f"iLO model extracted: {ilo_model}")
+                            print(f"Server generation determined: {server['Gen']}")
+                            
+                # If we've reached here, we've processed the JSON regardless of whether we found everything
+                return True
+            except json.JSONDecodeError as e:
+                print(f"Error parsing JSON from installSetLogs.log: {e}")
+                continue
+    
         print("Failed to extract information: No matching data found")
         return False
     
@@ -126,8 +192,8 @@ def extract_ilo_model(file_path, info_dict):
         print(f"Error extracting information from log: {e}")
         return False
 
-def extract_isr(serverlogs_path: str, log_path: str, info_dict: dict):
-    """Extract Install Set Response from log file and update info_dict."""
+def extract_isr(serverlogs_path: str, content: bytes, info_dict: dict):
+    """Extract Install Set Response from installSetLogs.log content and update info_dict."""
     try:
         # Get already extracted UUID from info_dict
         server_uuid = info_dict.get("Server", {}).get("UUID")
@@ -141,87 +207,128 @@ def extract_isr(serverlogs_path: str, log_path: str, info_dict: dict):
             
         print(f"[DEBUG] Using UUID folder: {server_uuid}")
         
-        # Read the full log file
-        try:
-            with open(log_path, 'r') as f:
-                content = f.read()
-        except FileNotFoundError:
-            raise FileNotFoundError(f"Log file not found at: {log_path}")
+        # Locate the first two occurrences of the UUID in the log content
+        uuid_bytes = server_uuid.encode()
+        first_match_pos = content.find(uuid_bytes)
+        second_match_pos = content.find(uuid_bytes, first_match_pos + len(uuid_bytes)) if first_match_pos != -1 else -1
+        print(f"[DEBUG] UUID matches at: {first_match_pos}, {second_match_pos}")
 
-        # Find all positions where the UUID appears
-        uuid_positions = [m.start() for m in re.finditer(re.escape(server_uuid), content)]
-        print(f"[DEBUG] Found {len(uuid_positions)} matches at: {uuid_positions}")
-
-        if len(uuid_positions) < 2:
+        if second_match_pos == -1:
             raise ValueError("Second UUID match not found in the log file.")
 
-        # Slice from the second match onward
-        second_match_pos = uuid_positions[1]
-        content_from_second = content[second_match_pos:]
-
         # Find the start of JSON after second UUID
-        json_start = content_from_second.find('{')
+        json_start = content.find(b'{', second_match_pos)
         if json_start == -1:
             raise ValueError("No JSON object found after second UUID.")
 
-        # Extract the full JSON object using brace balancing
-        json_str = ''
-        brace_count = 0
-        for char in content_from_second[json_start:]:
-            json_str += char
-            if char == '{':
-                brace_count += 1
-            elif char == '}':
-                brace_count -= 1
-                if brace_count == 0:
-                    break
-
-        # Decode JSON
+        # Decode the JSON object in place; only the bytes it spans are copied
         try:
-            isr_data = json.loads(json_str)
+            isr_data = _decode_json_at(content, json_start)
         except json.JSONDecodeError:
             raise ValueError("Failed to decode JSON.")
 
         # Populate info_dict
         hapi = isr_data.get("hapi", {})
 
-        info_dict["Install set Response"]["SPP"] = hapi.get("install_set", {}).get("Name", "")
-        info_dict["Install set Response"]["Retry"] = "No"
-        info_dict["Install set Response"]["Dependency"] = ", ".join(hapi.get("dependency_failures", [])) or "None"
-        info_dict["Install set Response"]["SUM Version"] = "sum service"
+        isr = info_dict["Install set Response"]
+        isr["SPP"] = hapi.get("install_set", {}).get("Name", "")
+        isr["Retry"] = "No"
+        isr["Dependency"] = ", ".join(hapi.get("dependency_failures", [])) or "None"
+        isr["SUM Version"] = "sum service"
         
     except Exception as e:
         print(f"Error in extract_isr: {str(e)}")
         raise
     
-def extract_installset_info(file_path, info_dict):
+def extract_installset_info(content, info_dict):
+    """Extract installation method, force and policy from installSetLogs.log content (bytes)."""
     try:
-        with open(file_path, 'r') as f:
-            content = f.read()
-            
-            # Installation Method
-            install_method_match = re.search(r'"update_type"\s*:\s*"([^"]+)"', content)
-            if install_method_match:
-                info_dict["Firmware Update"]["Installation Method"] = install_method_match.group(1)
-
-            # Force
-            force_match = re.search(r'"rewrite"\s*:\s*(true|false)', content)
-            if force_match:
-                info_dict["Firmware Update"]["Force"] = force_match.group(1).capitalize()
-
-            # Policy
-            downgrade_match = re.search(r'"downgrade"\s*:\s*(true|false)', content)
-            if downgrade_match:
-                policy = "Exact Match" if downgrade_match.group(1) == "true" else "LowerThanBaseline"
-                info_dict["Firmware Update"]["Policy"] = policy
+        fw = info_dict["Firmware Update"]
+
+        # Installation Method
+        install_method_match = _INSTALL_METHOD_RE.search(content)
+        if install_method_match:
+            fw["Installation Method"] = install_method_match.group(1).decode('utf-8', 'replace')
+
+        # Force
+        force_match = _REWRITE_RE.search(content)
+        if force_match:
+            fw["Force"] = force_match.group(1).decode().capitalize()
+
+        # Policy
+        downgrade_match = _DOWNGRADE_RE.search(content)
+        if downgrade_match:
+            policy = "Exact Match" if downgrade_match.group(1) == b"true" else "LowerThanBaseline"
+            fw["Policy"] = policy
 
     except Exception as e:
         print(f"Error reading installSetLogs.log: {e}")
 
+def extract_installset_fields(content):
+    """Run the UUID-independent installSetLogs.log extractors once.
+
+    Returns {section: {field: value}} with only the fields the extractors set,
+    ready to be merged into every UUID's info_dict.
+    """
+    defaults = initialize_dictionary()
+    scratch = initialize_dictionary()
+    extract_installset_info(content, scratch)
+    extract_ilo_model(content, scratch)
+    return {
+        section: {field: value for field, value in scratch[section].items() if value != defaults[section][field]}
+        for section in ("Server", "Firmware Update")
+    }
+
+def _map_file(file):
+    """Memory-map an open binary file read-only (empty files map to b'')."""
+    if os.fstat(file.fileno()).st_size == 0:
+        return contextlib.nullcontext(b'')
+    return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+def _line_at(content, pos):
+    """Return the decoded log line containing byte offset pos."""
+    start = content.rfind(b'\n', 0, pos) + 1
+    end = content.find(b'\n', pos)
+    if end == -1:
+        end = len(content)
+    return content[start:end].decode('utf-8', 'replace')
+
+def parse_sut_fields(section):
+    """Return the SUT mode/state/version found in a bracketed SUT status section.
+
+    Tries the combined pattern first and falls back to matching each field on
+    its own, so one malformed field does not lose the others.
+    """
+    fields_match = _SUT_FIELDS_RE.search(section)
+    if fields_match:
+        return {field: value.strip() for field, value in fields_match.groupdict().items()}
+    fields = {}
+    for field, pattern in (("mode", _SUT_MODE_RE), ("state", _SUT_STATE_RE), ("version", _SUT_VERSION_RE)):
+        match = pattern.search(section)
+        if match:
+            fields[field] = match.group(1).strip()
+    return fields
+
 def extract_firmware_log_info(log_path, uuid, info_dict):
     try:
-        with open(log_path, 'r') as file:
-            lines = file.readlines()
+        # Collect only the lines carrying a baseline or SUT marker in a single pass
+        with open(log_path, 'rb') as file, _map_file(file) as content:
+            marker_lines = [
+                (marker.lastgroup, _line_at(content, marker.start()))
+                for marker in _FW_LINE_RE.finditer(content)
+            ]
+
+            # Look for the last occurrence of Install State, walking back from the end
+            last_install_state = None
+            pos = content.rfind(_FDBS_MARKER)
+            while pos != -1:
+                line = _line_at(content, pos)
+                if uuid in line:
+                    match = _FDBS_RE.search(line)
+                    if match:
+                        last_install_state = match.group(1).strip()
+                        break
+                pos = content.rfind(_FDBS_MARKER, 0, pos)
 
         spp_used = ""
         sut_mode = ""
@@ -229,56 +336,44 @@ def extract_firmware_log_info(log_path, uuid, info_dict):
         sut_running_version = ""
         install_state = ""
 
-        for line in lines:
-            if "The selected baseline" in line and "is absaroka compliant = true" in line:
-                match = re.search(r'The selected baseline (.*?) is absaroka compliant = true', line)
-                if match:
-                    spp_used = match.group(1)
-            
+        for kind, line in marker_lines:
+            if kind == "baseline":
+                if "is absaroka compliant = true" in line:
+                    match = _BASELINE_RE.search(line)
+                    if match:
+                        spp_used = match.group(1)
+
             # Extract SUT information from the log
-            if f"Successfully got SUT status from server via RIS for {uuid}" in line:
-                # Extract information from the line that looks like:
-                # [Mode: AutoStageService State: DisabledVersion: 5.2.0.0Type: #SUT.v5_2_0.SUT...]
-                # Find the section between square brackets
-                match = re.search(r'\[(.*?)\]', line)
-                if match:
-                    section = match.group(1)
-                    
-                    # Extract Mode
-                    mode_match = re.search(r'Mode: (.*?)Service', section)
-                    if mode_match:
-                        sut_mode = mode_match.group(1).strip()
-                    
-                    # Extract State
-                    state_match = re.search(r'State: ([^V]*?)Version:', section)
-                    if state_match:
-                        sut_service_state = state_match.group(1).strip()
-                    
-                    # Extract Version
-                    version_match = re.search(r'Version: ([^T]*?)Type:', section)
-                    if version_match:
-                        sut_running_version = version_match.group(1).strip()
-
-        # Look for the last occurrence of Install State
-        for line in reversed(lines):
-            if "FirmwareDriverBaselineSettings on server" in line and uuid in line:
-                match = re.search(r'FirmwareDriverBaselineSettings on server .*? is (.*)', line)
-                if match:
-                    install_state = match.group(1).strip()
-                    # print(f"Install state found: {install_state}")
-                    pattern = r'"State"\s*:\s*"([^"]*)"'
-                    install_state = re.search(pattern, install_state)
-                    install_state = install_state.group(1) if install_state else "Unknown"
-                    break
-
-        info_dict["Firmware Update"]["SPP Used"] = spp_used
-        info_dict["Firmware Update"]["SUT Mode"] = sut_mode
-        info_dict["Firmware Update"]["SUT Service State"] = sut_service_state
-        info_dict["Firmware Update"]["SUT Running Version"] = sut_running_version
-        info_dict["Server"]["SUT Mode"] = sut_mode
-        info_dict["Server"]["SUT Service State"] = sut_service_state
-        info_dict["Server"]["SUT Running Version"] = sut_running_version
-        info_dict["Firmware Update"]["Install state"] = install_state
+            elif kind == "sut":
+                if f"Successfully got SUT status from server via RIS for {uuid}" in line:
+                    # Extract information from the line that looks like:
+                    # [Mode: AutoStageService State: DisabledVersion: 5.2.0.0Type: #SUT.v5_2_0.SUT...]
+                    # Find the section between square brackets
+                    match = _SUT_SECTION_RE.search(line)
+                    if match:
+                        section = match.group(1)
+
+                        # Extract Mode, State and Version
+                        fields = parse_sut_fields(section)
+                        sut_mode = fields.get("mode", sut_mode)
+                        sut_service_state = fields.get("state", sut_service_state)
+                        sut_running_version = fields.get("version", sut_running_version)
+
+        if last_install_state is not None:
+            # print(f"Install state found: {last_install_state}")
+            install_state = _STATE_JSON_RE.search(last_install_state)
+            install_state = install_state.group(1) if install_state else "Unknown"
+
+        fw = info_dict["Firmware Update"]
+        server = info_dict["Server"]
+        fw["SPP Used"] = spp_used
+        fw["SUT Mode"] = sut_mode
+        fw["SUT Service State"] = sut_service_state
+        fw["SUT Running Version"] = sut_running_version
+        server["SUT Mode"] = sut_mode
+        server["SUT Service State"] = sut_service_state
+        server["SUT Running Version"] = sut_running_version
+        fw["Install state"] = install_state
 
     except Exception as e:
         print(f"Error reading firmware update log file: {e}")
@@ -286,18 +381,20 @@ def extract_firmware_log_info(log_path, uuid, info_dict):
 def process_dependency_failure_json(file_path, info_dict):
     """Process DependencyFailure.json to extract component information."""
     try:
-        with open(file_path, 'r') as file:
-            data = json.load(file)
+        with open(file_path, 'rb') as file:
+            data = orjson.loads(file.read())
             
         # Extract Install set Response information
         if "install_set" in data:
-            if "Name" in data["install_set"]:
-                info_dict["Install set Response"]["SPP"] = data["install_set"]["Name"]
-            if "Description" in data["install_set"]:
-                info_dict["Install set Response"]["Dependency"] = data["install_set"]["Description"]
+            install_set = data["install_set"]
+            isr = info_dict["Install set Response"]
+            if "Name" in install_set:
+                isr["SPP"] = install_set["Name"]
+            if "Description" in install_set:
+                isr["Dependency"] = install_set["Description"]
         
         # Clear existing components to ensure only this UUID's components are included
-        info_dict["Components"] = []
+        components = info_dict["Components"] = []
         
         # Extract Component information
         if "sequence_details" in data:
@@ -325,7 +422,7 @@ def process_dependency_failure_json(file_path, info_dict):
                             component_dict["TargetGUID"] = installed_ver["Target"]
                 
                 # Add component to the list
-                info_dict["Components"].append(component_dict)
+                components.append(component_dict)
                 
                 print(f"Added component: {component_dict['FileName']}")
         
@@ -334,17 +431,21 @@ def process_dependency_failure_json(file_path, info_dict):
         print(f"Error processing DependencyFailure.json: {e}")
         return False
 
-def find_dependency_failure_json_files(serverlogs_dir):
-    """Find all DependencyFailure.json files in the serverlogs directory and its subdirectories."""
-    dependency_files = []
-    
-    # Walk through all subdirectories in serverlogs_dir
-    for root, dirs, files in os.walk(serverlogs_dir):
-        # Check if DependencyFailure.json exists in this directory
-        if "DependencyFailure.json" in files:
-            dependency_files.append(os.path.join(root, "DependencyFailure.json"))
-    
-    return dependency_files
+def index_serverlogs(serverlogs_dir):
+    """Map each UUID folder in serverlogs_dir to {file name: path} for the files it holds.
+
+    Built with one scandir pass per folder so the per-UUID lookups need no stat calls.
+    """
+    serverlogs_index = {}
+    try:
+        with os.scandir(serverlogs_dir) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    with os.scandir(entry.path) as files:
+                        serverlogs_index[entry.name] = {f.name: f.path for f in files if f.is_file()}
+    except FileNotFoundError:
+        pass
+    return serverlogs_index
 
 def extract_sut_info_from_log_content(log_content, uuid):
     """Extract SUT information directly from log content."""
@@ -354,58 +455,59 @@ def extract_sut_info_from_log_content(log_content, uuid):
         "SUT Running Version": "Not Available"
     }
     
-    # Look for the SUT status line
-    pattern = rf"Successfully got SUT status from server via RIS for {uuid}, \[(.*?)\]"
-    matches = re.findall(pattern, log_content)
+    # Look for the first SUT status line whose bracketed section closes on the same line
+    marker = f"Successfully got SUT status from server via RIS for {uuid}, ["
+    sut_section = None
+    start = log_content.find(marker)
+    while start != -1:
+        start += len(marker)
+        end = log_content.find("]", start)
+        line_end = log_content.find("\n", start)
+        if end != -1 and (line_end == -1 or end < line_end):
+            sut_section = log_content[start:end]
+            break
+        start = log_content.find(marker, start)
     
-    if matches:
-        sut_section = matches[0]
+    if sut_section is not None:
         print(f"Found SUT status section: {sut_section}")
         
-        # Extract Mode
-        mode_match = re.search(r'Mode: ([^S]*?)State:', sut_section)
-        if mode_match:
-            sut_info["SUT Mode"] = mode_match.group(1).strip()
-            
-        # Extract State
-        state_match = re.search(r'State: ([^V]*?)Version:', sut_section)
-        if state_match:
-            sut_info["SUT Service State"] = state_match.group(1).strip()
-            
-        # Extract Version
-        version_match = re.search(r'Version: ([^T]*?)Type:', sut_section)
-        if version_match:
-            sut_info["SUT Running Version"] = mode_match.group(1).strip()
+        # Extract Mode, State and Version
+        fields = parse_sut_fields(sut_section)
+        if "mode" in fields:
+            sut_info["SUT Mode"] = fields["mode"]
+        if "state" in fields:
+            sut_info["SUT Service State"] = fields["state"]
+        if "version" in fields:
+            sut_info["SUT Running Version"] = fields["version"]
             
     return sut_info
     
 def connect_to_mongodb(max_retries=3, retry_delay=2):
     """Connect to MongoDB with retry logic"""
     load_dotenv()
-    mongo_user = quote_plus(os.getenv("MONGO_USER"))
-    mongo_pass = quote_plus(os.getenv("MONGO_PASS"))
     mongo_host = os.getenv("MONGO_HOST", "localhost")
     mongo_port = os.getenv("MONGO_PORT", "27017")
     mongo_db_name = os.getenv("MONGO_DB", "log_analysis_db")
     
     # Construct connection string
-    mongo_uri = f"mongodb://{mongo_user}:{mongo_pass}@{mongo_host}:{mongo_port}/"
+    mongo_uri = build_mongo_uri()
     
     for attempt in range(max_retries):
         try:
             print(f"Connecting to MongoDB at {mongo_host}:{mongo_port} (attempt {attempt+1}/{max_retries})...")
-            client = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000)
-            # Force a connection to verify it works
-            client.admin.command('ismaster')
+            client = get_mongo_client(mongo_uri)
+            # Force a connection to verify it works; 'ping' is the cheapest round trip
+            client.admin.command('ping')
             print("Successfully connected to MongoDB")
             
             # Test database access
             db = client[mongo_db_name]
             print(f"Successfully accessed database: {mongo_db_name}")
             
-            # List available collections
-            collections = db.list_collection_names()
-            print(f"Available collections: {collections}")
+            # Listing collections is a catalog query, so only do it when debugging
+            if os.getenv("DEBUG", "False").lower() in ("true", "1", "t"):
+                collections = db.list_collection_names()
+                print(f"Available collections: {collections}")
             
             return client, mongo_db_name
             
@@ -427,7 +529,130 @@ def create_processed_directory():
     print(f"Created/verified processed directory: {processed_dir}")
     return processed_dir
 
+def process_uuid(json_file, output_dir, version, model_number, processed_dir, machine_name, serverlogs_index, installset_content, installset_fields):
+    """Build the analysis document for one UUID JSON file and save it to processed_dir.
+
+    serverlogs_index is the result of index_serverlogs() for output_dir/serverlogs and
+    installset_content the bytes of installSetLogs.log (None if the file is missing),
+    with installset_fields the result of extract_installset_fields() on it.
+    Returns the populated info_dict, or None if the UUID JSON file could not be loaded.
+    """
+    serverlogs_dir = os.path.join(output_dir, "serverlogs")
+
+    uuid = os.path.splitext(os.path.basename(json_file))[0]
+    print(f"\n=== Processing JSON file for UUID: {uuid} ===")
+
+    # Create a new dictionary for each JSON file
+    info_dict = initialize_dictionary()
+
+    # Load the JSON file's contents and merge into the new dictionary
+    try:
+        with open(json_file, 'rb') as f:
+            json_data = orjson.loads(f.read())
+        info_dict.update(json_data)
+    except Exception as e:
+        print(f"Error loading JSON file {json_file}: {e}")
+        return None
+
+    # Update shared fields
+    if version:
+        info_dict["OneView"]["OV version"] = version
+        print(f"OneView version extracted: {version}")
+    else:
+        print("Failed to extract OneView version")
+
+    if model_number:
+        info_dict["OneView"]["OV Type"] = model_number
+        print(f"OneView type extracted: {model_number}")
+    else:
+        print("Failed to extract OneView type")
+
+    # Set UUID
+    info_dict["Server"]["UUID"] = uuid
+    print(f"Server UUID set: {uuid}")
+
+    # Extract installSetLogs info
+    if installset_fields is not None:
+        for section, fields in installset_fields.items():
+            info_dict[section].update(fields)
+    else:
+        print(f"Install set log file not found: {os.path.join(output_dir, 'installSetLogs.log')}")
+
+    # Extract ISR for this UUID
+    if os.path.exists(serverlogs_dir) and installset_content is not None:
+        try:
+            extract_isr(serverlogs_dir, installset_content, info_dict)
+        except Exception as e:
+            print(f"Failed to extract ISR for UUID {uuid}: {e}")
+
+    # Files present in this UUID's serverlogs folder
+    uuid_files = serverlogs_index.get(uuid, {})
+
+    # Try to extract firmware log info using UUID
+    server_log_path = uuid_files.get(f"{uuid}.log")
+    if server_log_path:
+        print(f"Processing server log file: {server_log_path}")
+        extract_firmware_log_info(server_log_path, uuid, info_dict)
+    else:
+        print(f"Server log file not found: {os.path.join(serverlogs_dir, uuid, f'{uuid}.log')}")
+
+        # Try to extract SUT info from uuid.log if it exists
+        uuid_log_path = uuid_files.get("uuid.log")
+        if uuid_log_path:
+            try:
+                with open(uuid_log_path, 'r') as file:
+                    uuid_log_content = file.read()
+                    sut_info = extract_sut_info_from_log_content(uuid_log_content, uuid)
+
+                    if sut_info:
+                        sut_fields = {
+                            "SUT Mode": sut_info.get("SUT Mode", ""),
+                            "SUT Service State": sut_info.get("SUT Service State", ""),
+                            "SUT Running Version": sut_info.get("SUT Running Version", "")
+                        }
+                        info_dict["Server"].update(sut_fields)
+                        info_dict["Firmware Update"].update(sut_fields)
+            except Exception as e:
+                print(f"Error processing uuid.log: {e}")
+
+    # Process dependency failure JSON for this UUID
+    dependency_path = uuid_files.get("DependencyFailure.json")
+    if dependency_path:
+        print(f"Processing dependency file: {dependency_path}")
+        process_dependency_failure_json(dependency_path, info_dict)
+    else:
+        print(f"No DependencyFailure.json found at: {os.path.join(serverlogs_dir, uuid, 'DependencyFailure.json')}")
+
+    # Output the updated dictionary; serialising it is skipped unless debugging
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("\nUpdated Dictionary for UUID %s:\n%s", uuid, orjson.dumps(info_dict, option=orjson.OPT_INDENT_2).decode())
+
+    # Save the dictionary as JSON in the processed directory
+    machine_json_path = os.path.join(processed_dir, f"{machine_name}_{uuid}_analysis.json")
+    try:
+        with open(machine_json_path, 'wb') as f:
+            f.write(orjson.dumps(info_dict, option=orjson.OPT_INDENT_2))
+        print(f"Saved analysis results to {machine_json_path}")
+    except Exception as e:
+        print(f"Error saving JSON file: {e}")
+
+    return info_dict
+
+# Per-process worker bound once by the pool initializer, so the shared
+# arguments (notably installset_content) are not re-pickled for every UUID
+_worker = None
+
+def _init_worker(worker):
+    global _worker
+    _worker = worker
+
+def _run_worker(json_file):
+    return _worker(json_file)
+
 def main():
+    debug = os.getenv("DEBUG", "False").lower() in ("true", "1", "t")
+    logging.basicConfig(level=logging.DEBUG if debug else logging.WARNING, format='%(message)s')
+
     # Get the machine name from environment variable
     machine_name = os.getenv("MONGO_COLLECTION", "unknown_machine")
     
@@ -462,11 +687,17 @@ def main():
     # Read shared information once
     version = read_version_file(version_file_path) if os.path.exists(version_file_path) else None
     model_number = read_model_number(properties_file_path) if os.path.exists(properties_file_path) else None
+    installset_content = None
+    installset_fields = None
+    if os.path.exists(installset_log_path):
+        with open(installset_log_path, 'rb') as f:
+            installset_content = f.read()
+        # Installation method, policy, OS and iLO model are the same for every UUID
+        installset_fields = extract_installset_fields(installset_content)
     
     # Find all JSON files in the output directory that match UUID pattern
-    json_files = glob.glob(os.path.join(output_dir, "*.json"))
-    uuid_pattern = re.compile(r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\.json$')
-    json_files = [f for f in json_files if uuid_pattern.match(os.path.basename(f))]
+    with os.scandir(output_dir) as entries:
+        json_files = [entry.path for entry in entries if _UUID_JSON_RE.match(entry.name) and entry.is_file()]
     
     if not json_files:
         print(f"No UUID JSON files found in {output_dir}")
@@ -474,7 +705,31 @@ def main():
     
     print(f"Found {len(json_files)} JSON files: {[os.path.basename(f) for f in json_files]}")
     
-    # Connect to MongoDB once
+    # Process the UUIDs in parallel; each one reads its own logs and writes its own JSON
+    worker = functools.partial(
+        process_uuid,
+        output_dir=output_dir,
+        version=version,
+        model_number=model_number,
+        processed_dir=processed_dir,
+        machine_name=machine_name,
+        serverlogs_index=index_serverlogs(serverlogs_dir),
+        installset_content=installset_content,
+        installset_fields=installset_fields
+    )
+    # MACHINE_WORKERS machines may be analyzed at the same time, so by default each
+    # analysis takes an equal share of the cores instead of all of them
+    machine_workers = max(1, int(os.getenv("MACHINE_WORKERS", 1)))
+    default_workers = max(1, (os.cpu_count() or 1) // machine_workers)
+    max_workers = min(len(json_files), int(os.getenv("ANALYSIS_WORKERS", default_workers)))
+    if max_workers > 1:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(worker,)) as executor:
+            results = list(executor.map(_run_worker, json_files))
+    else:
+        results = [worker(json_file) for json_file in json_files]
+    docs = [info_dict for info_dict in results if info_dict is not None]
+    
+    # Connect to MongoDB once, in the parent process after the workers are done
     try:
         client, mongo_db_name = connect_to_mongodb(max_retries=3, retry_delay=2)
         mongo_collection_name = os.getenv("MONGO_COLLECTION", "extracted_info")
@@ -483,138 +738,50 @@ def main():
         print(f"Using collection: {mongo_collection_name}")
     except Exception as e:
         print(f"Failed to connect to MongoDB: {str(e)}")
+        print(f"Results are still available in the JSON files under: {processed_dir}")
         return
     
-    # Process each JSON file
-    for json_file in json_files:
-        uuid = os.path.splitext(os.path.basename(json_file))[0]
-        print(f"\n=== Processing JSON file for UUID: {uuid} ===")
-        
-        # Create a new dictionary for each JSON file
-        info_dict = initialize_dictionary()
-        
-        # Load the JSON file's contents and merge into the new dictionary
-        try:
-            with open(json_file, 'r') as f:
-                json_data = json.load(f)
-            info_dict.update(json_data)
-        except Exception as e:
-            print(f"Error loading JSON file {json_file}: {e}")
-            continue
-        
-        # Update shared fields
-        if version:
-            info_dict["OneView"]["OV version"] = version
-            print(f"OneView version extracted: {version}")
-        else:
-            print("Failed to extract OneView version")
-        
-        if model_number:
-            info_dict["OneView"]["OV Type"] = model_number
-            print(f"OneView type extracted: {model_number}")
-        else:
-            print("Failed to extract OneView type")
-        
-        # Set UUID
-        info_dict["Server"]["UUID"] = uuid
-        print(f"Server UUID set: {uuid}")
-        
-        # Extract installSetLogs info
-        if os.path.exists(installset_log_path):
-            extract_installset_info(installset_log_path, info_dict)
-        else:
-            print(f"Install set log file not found: {installset_log_path}")
-        
-        # Extract ISR for this UUID
-        if os.path.exists(serverlogs_dir) and os.path.exists(installset_log_path):
-            try:
-                extract_isr(serverlogs_dir, installset_log_path, info_dict)
-            except Exception as e:
-                print(f"Failed to extract ISR for UUID {uuid}: {e}")
-        
-        # Try to extract firmware log info using UUID
-        server_log_path = os.path.join(serverlogs_dir, uuid, f"{uuid}.log")
-        if os.path.exists(server_log_path):
-            print(f"Processing server log file: {server_log_path}")
-            extract_firmware_log_info(server_log_path, uuid, info_dict)
-        else:
-            print(f"Server log file not found: {server_log_path}")
-            
-            # Try to extract SUT info from uuid.log if it exists
-            uuid_log_path = os.path.join(serverlogs_dir, uuid, "uuid.log")
-            if os.path.exists(uuid_log_path):
-                try:
-                    with open(uuid_log_path, 'r') as file:
-                        uuid_log_content = file.read()
-                        sut_info = extract_sut_info_from_log_content(uuid_log_content, uuid)
-                        
-                        if sut_info:
-                            info_dict["Server"]["SUT Mode"] = sut_info.get("SUT Mode", "")
-                            info_dict["Server"]["SUT Service State"] = sut_info.get("SUT Service State", "")
-                            info_dict["Server"]["SUT Running Version"] = sut_info.get("SUT Running Version", "")
-                            info_dict["Firmware Update"]["SUT Mode"] = sut_info.get("SUT Mode", "")
-                            info_dict["Firmware Update"]["SUT Service State"] = sut_info.get("SUT Service State", "")
-                            info_dict["Firmware Update"]["SUT Running Version"] = sut_info.get("SUT Running Version", "")
-                except Exception as e:
-                    print(f"Error processing uuid.log: {e}")
-        
-        # Try to extract iLO model
-        if os.path.exists(installset_log_path):
-            extract_ilo_model(installset_log_path, info_dict)
-        
-        # Process dependency failure JSON for this UUID
-        dependency_path = os.path.join(serverlogs_dir, uuid, "DependencyFailure.json")
-        if os.path.exists(dependency_path):
-            print(f"Processing dependency file: {dependency_path}")
-            process_dependency_failure_json(dependency_path, info_dict)
-        else:
-            print(f"No DependencyFailure.json found at: {dependency_path}")
-        
-        # Output the updated dictionary
-        print(f"\nUpdated Dictionary for UUID {uuid}:")
-        print(json.dumps(info_dict, indent=4))
-        
-        # Save the dictionary as JSON in the processed directory
-        machine_json_path = os.path.join(processed_dir, f"{machine_name}_{uuid}_analysis.json")
-        try:
-            with open(machine_json_path, 'w') as f:
-                json.dump(info_dict, f, indent=4)
-            print(f"Saved analysis results to {machine_json_path}")
-        except Exception as e:
-            print(f"Error saving JSON file: {e}")
-        
-        # Insert the dictionary into MongoDB
+    # Insert all documents into MongoDB in one round trip
+    if docs:
         try:
-            print(f"\n=== MONGODB UPDATE PROCESS for UUID {uuid} ===")
+            print(f"\n=== MONGODB UPDATE PROCESS ===")
             print(f"Machine: {machine_name}")
-            print(f"Data to insert: {json.dumps(info_dict, indent=2)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                for doc in docs:
+                    logger.debug("Data to insert for UUID %s: %s", doc['Server']['UUID'], orjson.dumps(doc, option=orjson.OPT_INDENT_2).decode())
             
-            # Insert the document
-            print(f"Inserting document into collection '{mongo_collection_name}'...")
-            insert_result = collection.insert_one(info_dict)
+            # Insert the documents; unordered so one bad document does not block the rest
+            unacknowledged = os.getenv("MONGO_UNACKNOWLEDGED_WRITES", "False").lower() in ("true", "1", "t")
+            if unacknowledged:
+                # w=0: fire-and-forget, the server sends no reply to wait for
+                collection = collection.with_options(write_concern=WriteConcern(w=0))
+            print(f"Inserting {len(docs)} documents into collection '{mongo_collection_name}'...")
+            insert_result = collection.insert_many(docs, ordered=False)
             
-            if insert_result.acknowledged:
-                print(f"MongoDB insert successful! Document ID: {insert_result.inserted_id}")
+            if unacknowledged:
+                print(f"Sent {len(insert_result.inserted_ids)} documents to MongoDB without acknowledgement (w=0)")
+            elif insert_result.acknowledged:
+                inserted_ids = insert_result.inserted_ids
+                print(f"MongoDB insert successful! Document IDs: {inserted_ids}")
                 
-                # Verify the insertion by reading back the document
-                inserted_doc = collection.find_one({"_id": insert_result.inserted_id})
-                if inserted_doc:
-                    print(f"Successfully verified document in MongoDB for UUID {uuid}")
+                # Verify the insertion with a single count instead of reading back each document
+                verified = collection.count_documents({"_id": {"$in": inserted_ids}})
+                if verified == len(inserted_ids):
+                    print(f"Successfully verified {verified} documents in MongoDB")
                 else:
-                    raise Exception(f"Document was inserted but could not be read back for UUID {uuid}")
+                    raise Exception(f"Only {verified}/{len(inserted_ids)} inserted documents could be read back")
             else:
-                raise Exception(f"Insert operation was not acknowledged by MongoDB for UUID {uuid}")
+                raise Exception("Insert operation was not acknowledged by MongoDB")
                 
         except Exception as e:
-            print(f"\n!!! ERROR INSERTING INTO MONGODB for UUID {uuid} !!!")
+            print(f"\n!!! ERROR INSERTING INTO MONGODB !!!")
             print(f"Error details: {str(e)}")
             print(f"Error type: {type(e).__name__}")
             print("Stack trace:")
             import traceback
             traceback.print_exc()
-            print(f"\nData analysis completed but MongoDB storage failed for UUID {uuid}.")
-            print(f"Results are still available in the JSON file: {machine_json_path}")
-            continue  # Continue with next JSON file
+            print(f"\nData analysis completed but MongoDB storage failed for machine {machine_name}.")
+            print(f"Results are still available in the JSON files under: {processed_dir}")
     
     # Close the MongoDB connection
     try:
@@ -1,7 +1,7 @@
 import os
-import shutil
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(message)s')
@@ -24,11 +24,49 @@ PROTECTED_FILES = [
     "orchestrator.py",  # Orchestrator script
     "1.py",           # Script 1
     "2.py",           # Script 2
+    "mongo_conn.py",  # Shared MongoDB connection settings
     "3.py",           # This script
     "processing.log",  # Log file
     "project_run.log"  # Project run log
 ]
 
+# Machine directories may only be deleted from inside this directory (symlinks resolved)
+OUTPUT_BASE = os.path.realpath("./output")
+
+# Threads used to unlink files when deleting a machine directory
+RMTREE_WORKERS = 32
+
+def parallel_rmtree(path):
+    """
+    Delete a directory tree like shutil.rmtree, but unlink its files from a
+    thread pool and then remove the emptied directories bottom-up.
+
+    Args:
+        path (str): Directory to delete. Symlinks are refused, as with shutil.rmtree.
+    """
+    if os.path.islink(path):
+        raise OSError(f"Cannot call rmtree on a symbolic link: {path}")
+
+    files = []
+    dirs = []
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        dirs.append(current)
+        with os.scandir(current) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    files.append(entry.path)
+
+    with ThreadPoolExecutor(max_workers=RMTREE_WORKERS) as executor:
+        list(executor.map(os.unlink, files))
+
+    # Parents were recorded before their children, so reverse for bottom-up removal
+    for directory in reversed(dirs):
+        os.rmdir(directory)
+
 def safe_cleanup(machine_dir=None):
     """
     Safely clean up the specified machine directory while preserving source data.
@@ -46,15 +84,14 @@ def safe_cleanup(machine_dir=None):
     # Clean up the specified machine directory if it exists
     if os.path.exists(machine_dir) and os.path.isdir(machine_dir):
         # Verify that the directory is within the output directory to prevent accidental deletion
-        output_base = os.path.abspath("./output")
-        machine_path = os.path.abspath(machine_dir)
-        if not machine_path.startswith(output_base):
-            print(f"Error: Machine directory {machine_dir} is not within {output_base}. Skipping cleanup for safety.")
+        machine_path = os.path.realpath(machine_dir)
+        if machine_path == OUTPUT_BASE or os.path.commonpath([OUTPUT_BASE, machine_path]) != OUTPUT_BASE:
+            print(f"Error: Machine directory {machine_dir} is not within {OUTPUT_BASE}. Skipping cleanup for safety.")
             return
 
         print(f"Cleaning machine directory: {machine_dir}")
         try:
-            shutil.rmtree(machine_dir)
+            parallel_rmtree(machine_dir)
             print(f"Deleted machine directory: {machine_dir}")
         except Exception as e:
             print(f"Could not delete machine directory {machine_dir}: {e}")
@@ -1,9 +1,18 @@
 import os
+import sys
 import shutil
+import logging
+import logging.handlers
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import tarfile
-import glob
 import json
-import copy # Import the copy module
+import functools
+
+try:
+    import rapidgzip  # Parallel gzip inflate; falls back to tarfile's single-core gzip
+except ImportError:
+    rapidgzip = None
 
 # Get configuration from environment variables
 SOURCE_DIR = os.getenv("SOURCE_DIR", "")  # Directory containing required files and folders
@@ -20,6 +29,37 @@ REQUIRED_FOLDERS = [
     # Add more folder names as needed
 ]
 
+# Native tar with multithreaded pigz is used for extraction when both are installed
+TAR_BIN = shutil.which("tar")
+PIGZ_BIN = shutil.which("pigz")
+
+# Log records are buffered and written to stdout in batches of this many
+LOG_BUFFER_RECORDS = 1024
+
+logger = logging.getLogger(__name__)
+
+# Threads used to write the per-UUID JSON files
+JSON_WRITE_WORKERS = 16
+
+# Buffer size for tarfile's member copies (its default is 16 KiB)
+TAR_COPY_BUFSIZE = 2 * 1024 * 1024
+
+def unlink_existing_filter(member, dest_path):
+    """
+    tarfile extraction filter: apply the 'data' filter, then unlink any file already
+    at the member's destination, so a hard-linked copy is replaced rather than
+    written through into the source bundle.
+    """
+    member = tarfile.data_filter(member, dest_path)
+    target = os.path.join(dest_path, member.name)
+    if member.isreg() and os.path.lexists(target) and not os.path.isdir(target):
+        os.unlink(target)
+    return member
+
+# The 'data' extraction filter skips restoring owners (chown runs per member as root)
+# and rejects members that would land outside the target; needs Python 3.12 or 3.11.4+
+TAR_EXTRACT_OPTIONS = {"filter": unlink_existing_filter} if hasattr(tarfile, "data_filter") else {}
+
 # --- Predefined Empty JSON Structure ---
 EMPTY_JSON_STRUCTURE = {
     "OneView": {
@@ -64,40 +104,139 @@ EMPTY_JSON_STRUCTURE = {
         # If you need an empty list initially, change this to: "Components": []
     ]
 }
+# Every UUID gets the same file contents, so serialize them once
+EMPTY_JSON_BYTES = json.dumps(EMPTY_JSON_STRUCTURE, indent=4).encode("utf-8")
 # --- End Predefined Structure ---
 
-# --- Updated Function ---
-def generate_json_data_for_uuid(uuid_folder_path):
+def configure_logging():
+    """
+    Route this module's log records to stdout through a MemoryHandler, so they are
+    written in batches instead of one flushed write per record. Errors flush at once.
     """
-    Returns a deep copy of the predefined empty JSON structure.
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter('%(message)s'))
+    handler = logging.handlers.MemoryHandler(
+        LOG_BUFFER_RECORDS,
+        flushLevel=logging.ERROR,
+        target=stream_handler
+    )
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
 
-    Args:
-        uuid_folder_path (str): The path to the specific UUID folder being processed (used for logging).
+def flush_logging():
+    """Write out any buffered log records."""
+    for handler in logger.handlers:
+        handler.flush()
 
-    Returns:
-        dict: A dictionary with the predefined empty structure.
-    """
-    print(f"Generating empty JSON structure for UUID folder: {os.path.basename(uuid_folder_path)}")
-    # Return a deep copy to ensure each JSON file gets a unique dictionary instance
-    return copy.deepcopy(EMPTY_JSON_STRUCTURE)
-# --- End Updated Function ---
+def drop_from_page_cache(path):
+    """Ask the kernel to evict a file's cached pages; a no-op where unsupported."""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    except OSError as e:
+        logger.debug(f"Could not drop {path} from the page cache: {str(e)}")
 
-def extract_tar_gz(tar_file, extract_path):
+def extract_tar_gz(tar_file, extract_path, threads=None):
     """
-    Extract a .tar.gz file to the specified path.
+    Extract a .tar.gz file to the specified path and remove the archive
+    once extraction has succeeded.
     
     Args:
         tar_file (str): Path to the .tar.gz file
         extract_path (str): Directory to extract contents to
+        threads (int): Decompression threads; defaults to the CPU count
     """
     try:
-        with tarfile.open(tar_file, 'r:gz') as tar_ref:
-            tar_ref.extractall(extract_path)
-        print(f"Successfully extracted {tar_file} to {extract_path}")
+        if TAR_BIN and PIGZ_BIN:
+            # Keep the byte path out of Python entirely
+            result = subprocess.run(
+                [TAR_BIN, f"--use-compress-program={PIGZ_BIN} -p {threads or os.cpu_count() or 1}", "--no-same-owner", "--unlink-first", "-xf", tar_file, "-C", extract_path],
+                capture_output=True,
+                text=True
+            )
+            if result.returncode != 0:
+                raise RuntimeError(f"tar exited with {result.returncode}: {result.stderr.strip()}")
+        elif rapidgzip is not None:
+            # Inflate on several cores and untar the decompressed stream without seeking
+            with rapidgzip.open(tar_file, parallelization=threads or os.cpu_count() or 1) as gz:
+                with tarfile.open(fileobj=gz, mode='r|', bufsize=TAR_COPY_BUFSIZE, copybufsize=TAR_COPY_BUFSIZE) as tar_ref:
+                    tar_ref.extractall(extract_path, **TAR_EXTRACT_OPTIONS)
+        else:
+            # Forward-only stream mode reads the gzip data linearly in large blocks
+            with tarfile.open(tar_file, 'r|gz', bufsize=TAR_COPY_BUFSIZE, copybufsize=TAR_COPY_BUFSIZE) as tar_ref:
+                tar_ref.extractall(extract_path, **TAR_EXTRACT_OPTIONS)
+        logger.info(f"Successfully extracted {tar_file} to {extract_path}")
     except Exception as e:
-        print(f"Error extracting {tar_file}: {str(e)}")
+        logger.error(f"Error extracting {tar_file}: {str(e)}")
         raise
 
+    # Only reached when extraction succeeded; drop the now-redundant archive copy.
+    # Its compressed pages are evicted first, since a hard link from the source
+    # bundle keeps them cached after the unlink.
+    drop_from_page_cache(tar_file)
+    try:
+        os.unlink(tar_file)
+        logger.info(f"Removed {tar_file}")
+    except OSError as e:
+        logger.warning(f"Error removing {tar_file}: {str(e)}")
+
+def link_or_copy(src, dst):
+    """
+    Hard-link src to dst, replacing an existing dst, and fall back to a
+    regular copy where the filesystem refuses the link.
+    
+    Args:
+        src (str): Source file path
+        dst (str): Destination file path
+    """
+    try:
+        try:
+            os.link(src, dst)
+        except FileExistsError:
+            os.unlink(dst)
+            os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+def is_archive_name(name):
+    """Return True for serverlogs archive names (visible *.tar.gz files)."""
+    return name.endswith(".tar.gz") and not name.startswith(".")
+
+def extract_tar_gz_in_worker(tar_file, extract_path, threads=None):
+    """
+    extract_tar_gz for process-pool workers, which exit without running
+    logging's atexit flush, so their buffered records are written here.
+    """
+    try:
+        extract_tar_gz(tar_file, extract_path, threads)
+    finally:
+        flush_logging()
+
+def write_empty_uuid_json(uuid, output_dir):
+    """
+    Write the pre-serialized empty structure to output_dir/<uuid>.json.
+    
+    Args:
+        uuid (str): Name of the UUID folder
+        output_dir (str): Destination directory
+    """
+    try:
+        # Define the output JSON file path
+        output_json_path = os.path.join(output_dir, f"{uuid}.json")
+        
+        # Write the pre-serialized empty structure to the file
+        with open(output_json_path, 'wb') as f_json:
+            f_json.write(EMPTY_JSON_BYTES)
+        logger.info(f"Successfully created JSON file with empty structure: {output_json_path}")
+        
+    except Exception as json_e:
+        logger.error(f"Error generating JSON for {uuid}: {str(json_e)}")
+
 def copy_required_items(source_dir, required_files, required_folders, output_dir):
     """
     Copy specified files and folders from source_dir to output_dir,
@@ -110,89 +249,124 @@ def copy_required_items(source_dir, required_files, required_folders, output_dir
         output_dir (str): Destination directory
     """
     try:
-        # Create output directory if it doesn't exist
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        # Create output directory if it doesn't exist; every copy lands directly in it
+        os.makedirs(output_dir, exist_ok=True)
+
+        # SOURCE_DIR is a scratch copy made by prepare_machine, so on the same filesystem
+        # hard links replace byte copies. Extraction unlinks a file before replacing it
+        # (tar --unlink-first, or the unlinking tarfile filter), so it never writes through
+        # a link into SOURCE_DIR; without either, files are copied.
+        can_unlink_first = bool(TAR_BIN and PIGZ_BIN) or bool(TAR_EXTRACT_OPTIONS)
+        if can_unlink_first and os.stat(source_dir).st_dev == os.stat(output_dir).st_dev:
+            copy_function = link_or_copy
+        else:
+            copy_function = shutil.copy2
         
-        # Copy required files and folders
-        found_items = {"files": [], "folders": []}
-        for root, dirs, files in os.walk(source_dir):
-            # Copy specified files
-            for file in files:
-                if file in required_files:
-                    src_path = os.path.join(root, file)
-                    dst_path = os.path.join(output_dir, file)
-                    os.makedirs(os.path.dirname(dst_path), exist_ok=True)
-                    shutil.copy2(src_path, dst_path)
-                    found_items["files"].append(file)
+        # Archives copied into serverlogs are extracted in worker processes once the
+        # serverlogs copy has finished, so extraction never races the copy of the same
+        # tree while decompression still overlaps with copying the rest of the bundle
+        serverlogs_dir = os.path.join(output_dir, "serverlogs")
+        extract_workers = max(1, int(os.getenv("EXTRACT_WORKERS", os.cpu_count() or 1)))
+        extractions = []
+        with ProcessPoolExecutor(max_workers=extract_workers) as executor:
+            copied_archives = []
+
+            def copy_and_record_archive(src, dst):
+                copy_function(src, dst)
+                if os.path.dirname(dst) == serverlogs_dir and is_archive_name(os.path.basename(dst)):
+                    copied_archives.append(dst)
+
+            # Copy required files and folders, walking source_dir depth-first with scandir.
+            # Required folders are copied whole and not descended into; the first match of
+            # each name is used and the walk stops once every required item has been found.
+            remaining_files = set(required_files)
+            remaining_folders = set(required_folders)
+            found_items = {"files": [], "folders": []}
+            stack = [source_dir]
+            while stack and (remaining_files or remaining_folders):
+                subdirs = []
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            # Copy specified folders
+                            if entry.name in remaining_folders:
+                                dst_path = os.path.join(output_dir, entry.name)
+                                shutil.copytree(entry.path, dst_path, copy_function=copy_and_record_archive, dirs_exist_ok=True)
+                                if copied_archives:
+                                    # Write out buffered records first so a newly forked worker does not repeat them
+                                    flush_logging()
+                                    threads = max(1, (os.cpu_count() or 1) // min(extract_workers, len(copied_archives)))
+                                    extractions.extend(
+                                        executor.submit(extract_tar_gz_in_worker, archive, serverlogs_dir, threads)
+                                        for archive in copied_archives
+                                    )
+                                    copied_archives.clear()
+                                found_items["folders"].append(entry.name)
+                                remaining_folders.discard(entry.name)
+                            elif not entry.is_symlink():
+                                subdirs.append(entry.path)
+                        elif entry.name in remaining_files:
+                            # Copy specified files
+                            dst_path = os.path.join(output_dir, entry.name)
+                            copy_function(entry.path, dst_path)
+                            found_items["files"].append(entry.name)
+                            remaining_files.discard(entry.name)
+                        if not (remaining_files or remaining_folders):
+                            break
+                # Reversed so subdirectories are visited in listing order
+                stack.extend(reversed(subdirs))
             
-            # Copy specified folders
-            for folder in dirs:
-                if folder in required_folders:
-                    src_path = os.path.join(root, folder)
-                    dst_path = os.path.join(output_dir, folder)
-                    os.makedirs(os.path.dirname(dst_path), exist_ok=True)
-                    shutil.copytree(src_path, dst_path, dirs_exist_ok=True)
-                    found_items["folders"].append(folder)
-        
-        print(f"Copied files: {found_items['files']}")
-        print(f"Copied folders: {found_items['folders']}")
+            logger.info(f"Copied files: {found_items['files']}")
+            logger.info(f"Copied folders: {found_items['folders']}")
+
+            if extractions:
+                logger.info(f"Waiting for {len(extractions)} .tar.gz extractions in {serverlogs_dir}")
+            for future in extractions:
+                future.result()
         
-        # Extract .tar.gz files in output_dir/serverlogs
-        serverlogs_dir = os.path.join(output_dir, "serverlogs")
         if os.path.exists(serverlogs_dir):
-            tar_files = glob.glob(os.path.join(serverlogs_dir, "*.tar.gz"))
+            # Extract any archive that was already in place rather than copied above
+            with os.scandir(serverlogs_dir) as entries:
+                tar_files = [entry.path for entry in entries if is_archive_name(entry.name) and entry.is_file()]
             if tar_files:
-                print(f"Found {len(tar_files)} .tar.gz files in {serverlogs_dir}: {tar_files}")
+                logger.info(f"Found {len(tar_files)} .tar.gz files in {serverlogs_dir}: {tar_files}")
                 for tar_file in tar_files:
                     extract_tar_gz(tar_file, serverlogs_dir)
-                    # Optionally remove the .tar.gz file after extraction
-                    # os.remove(tar_file)
-                    # print(f"Removed {tar_file}")
-            else:
-                print(f"No .tar.gz files found in {serverlogs_dir}")
+            elif not extractions:
+                logger.info(f"No .tar.gz files found in {serverlogs_dir}")
 
             # --- Generate JSON for each UUID folder using predefined structure ---
-            print(f"Scanning for UUID folders in: {serverlogs_dir}")
-            for item in os.listdir(serverlogs_dir):
-                item_path = os.path.join(serverlogs_dir, item)
-                if os.path.isdir(item_path):
-                    print(f"Found potential UUID folder: {item}")
-                    uuid_folder_path = item_path
-                    try:
-                        # Generate the empty structure using the updated function
-                        json_data = generate_json_data_for_uuid(uuid_folder_path)
-                        
-                        # Define the output JSON file path
-                        output_json_filename = f"{item}.json"
-                        output_json_path = os.path.join(output_dir, output_json_filename)
-                        
-                        # Write the JSON data to the file
-                        with open(output_json_path, 'w') as f_json:
-                            json.dump(json_data, f_json, indent=4)
-                        print(f"Successfully created JSON file with empty structure: {output_json_path}")
-                        
-                    except Exception as json_e:
-                        print(f"Error generating JSON for {item}: {str(json_e)}")
+            logger.info(f"Scanning for UUID folders in: {serverlogs_dir}")
+            uuid_folders = []
+            with os.scandir(serverlogs_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        logger.debug(f"Found potential UUID folder: {entry.name}")
+                        uuid_folders.append(entry.name)
+
+            # The writes are independent and I/O-bound, so issue them from a thread pool
+            with ThreadPoolExecutor(max_workers=JSON_WRITE_WORKERS) as executor:
+                list(executor.map(functools.partial(write_empty_uuid_json, output_dir=output_dir), uuid_folders))
             # --- End JSON generation logic ---
 
         else:
-            print(f"serverlogs folder not found in copied contents")
+            logger.warning("serverlogs folder not found in copied contents")
                 
     except Exception as e:
-        print(f"Error during processing: {str(e)}")
+        logger.error(f"Error during processing: {str(e)}")
         raise
 
 def main():
+    configure_logging()
     try:
         # Verify source directory exists
         if not os.path.exists(SOURCE_DIR):
             raise FileNotFoundError(f"Source directory not found: {SOURCE_DIR}")
         
         copy_required_items(SOURCE_DIR, REQUIRED_FILES, REQUIRED_FOLDERS, OUTPUT_DIR)
-        print(f"Successfully copied required items and processed serverlogs .tar.gz files to {OUTPUT_DIR}")
+        logger.info(f"Successfully copied required items and processed serverlogs .tar.gz files to {OUTPUT_DIR}")
     except Exception as e:
-        print(f"Failed to process files: {str(e)}")
+        logger.error(f"Failed to process files: {str(e)}")
         exit(1)
 
 if __name__ == "__main__":
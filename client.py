@@ -4,22 +4,96 @@ import sys
 import subprocess
 import shutil
 import logging
+import logging.handlers
 import platform
+import random
 import time
 import re
+import functools
+import queue
+import tarfile
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import quote
 import traceback
+import certifi
+import urllib3
 from minio import Minio
 from minio.error import S3Error
 from dotenv import load_dotenv
 
+try:
+    import zstandard
+except ImportError:  # small-file batching is unavailable without it
+    zstandard = None
+
 # Load environment variables for MinIO
 load_dotenv()
 
 # Define a fixed bucket name for all machines
 MINIO_BUCKET_NAME = "hpe-log-analysis"
 
+# Number of files uploaded to MinIO concurrently
+MINIO_UPLOAD_CONCURRENCY = int(os.getenv("MINIO_UPLOAD_CONCURRENCY", 16))
+
+# MinIO client shared by all machines and upload threads, created on first use
+_minio_client = None
+_minio_client_lock = threading.Lock()
+
+# Files above this size are sent as multipart uploads with parts in flight concurrently
+LARGE_OBJECT_THRESHOLD = 64 * 1024 * 1024
+MULTIPART_PART_SIZE = 32 * 1024 * 1024
+MULTIPART_PARALLEL_UPLOADS = 4
+
+# Failed uploads are retried after an exponentially growing, jittered delay so that throttled
+# upload threads do not all retry in lockstep. S3 errors outside RETRYABLE_S3_CODES (AccessDenied,
+# NoSuchBucket, ...) fail immediately; network errors are always retried.
+MINIO_UPLOAD_ATTEMPTS = 3
+MINIO_RETRY_BASE_DELAY = 0.5
+RETRYABLE_S3_CODES = {"SlowDown", "InternalError", "RequestTimeout", "ServiceUnavailable"}
+
+# Opt-in: directories holding many small files are uploaded as one tar.zst object instead of one PUT
+# per file. Whoever downloads the bucket must unpack SMALL_FILE_BATCH_NAME objects, as 1.py does.
+BATCH_SMALL_FILES = os.getenv("MINIO_BATCH_SMALL_FILES", "False").lower() in ("true", "1", "t") and zstandard is not None
+SMALL_FILE_BATCH_NAME = "_small_files.tar.zst"
+SMALL_FILE_MAX_SIZE = 16 * 1024 * 1024
+SMALL_FILE_BATCH_MIN_FILES = 50
+SMALL_FILE_BATCH_MAX_BYTES = 256 * 1024 * 1024
+
+# MinIO client binary; when present and it is MinIO's mc, machine output is mirrored with it
+# instead of uploaded file by file
+MC_BIN = shutil.which(os.getenv("MC_BIN", "mc"))
+MC_ALIAS = "hpe"
+
+# Patterns used by sanitize_name, compiled once
+_NAME_SEPARATORS = str.maketrans("_ ", "--")
+_INVALID_NAME_CHARS_RE = re.compile(r"[^a-z0-9.-]+")
+_REPEATED_HYPHENS_RE = re.compile(r"-+")
+_REPEATED_DOTS_RE = re.compile(r"\.+")
+_NAME_END_RE = re.compile(r"[a-z0-9]$")
+
+# Number of machines prepared, extracted and uploaded at the same time. Kept small by
+# default because each machine's LogExtraction.py already extracts on every core
+MACHINE_WORKERS = int(os.getenv("MACHINE_WORKERS", 2))
+
+# Extracted machines waiting for the uploader. A worker that finds the queue full waits
+# before taking another machine, so at most MACHINE_WORKERS + UPLOAD_QUEUE_SIZE + 1
+# extracted machines are on disk at once
+UPLOAD_QUEUE_SIZE = 2
+
+# rm walks and unlinks a tree in C, which beats shutil.rmtree's per-entry Python loop on large trees
+RM_BIN = shutil.which("rm") if platform.system() != "Windows" else None
+
+# Buckets already checked or created by this process
+_ready_buckets = set()
+_bucket_lock = threading.Lock()
+
+# Threads used to delete 'required_files' directories during cleanup
+CLEANUP_WORKERS = os.cpu_count() or 4
+
 # Import shared tasks
 try:
     from shared_tasks import prepare_machine as shared_prepare_machine
@@ -28,12 +102,17 @@ except ImportError:
     logging.error("Failed to import from shared_tasks.py. Make sure it is in the same directory or Python path.")
     sys.exit(1)
 
-# Configure logging
+# Configure logging. The log file is written through a MemoryHandler so the upload threads do not
+# each take the file lock for a write and flush per record; errors and interpreter exit flush it.
+LOG_BUFFER_RECORDS = 1000
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s  '
+log_file_handler = logging.FileHandler("project_run.log", delay=True)
+log_file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
 logging.basicConfig(
     level=logging.INFO,
-    format= '%(asctime)s - %(levelname)s - %(message)s  ',
+    format=LOG_FORMAT,
     handlers=[
-        logging.FileHandler("project_run.log"),
+        logging.handlers.MemoryHandler(LOG_BUFFER_RECORDS, flushLevel=logging.ERROR, target=log_file_handler),
         logging.StreamHandler()
     ]
 )
@@ -72,7 +151,7 @@ def print_error(message):
     """Print an error message"""
     print(f"{Colors.RED}{Colors.BOLD}✗ {message}{Colors.ENDC}")
 
-def run_command(command, shell=False, check=True, cwd=None, capture_output=True):
+def run_command(command, shell=False, check=True, cwd=None, capture_output=True, env=None):
     """Run a shell command and return the result, logging output."""
     try:
         command_str = command if isinstance(command, str) else  '   '.join(command)
@@ -86,7 +165,8 @@ def run_command(command, shell=False, check=True, cwd=None, capture_output=True)
             stdout=subprocess.PIPE if capture_output else None,
             stderr=subprocess.PIPE if capture_output else None,
             text=True,
-            cwd=cwd
+            cwd=cwd,
+            env=env
         )
         
         if capture_output:
@@ -158,14 +238,26 @@ def setup_virtual_environment():
         print_error(f"Failed to set up virtual environment: {str(e)}")
         return False
 
-def get_minio_client():
-    """Get a MinIO client with proper error handling"""
+def create_minio_client():
+    """Create a MinIO client with proper error handling"""
     try:
+        # Keep enough idle connections for every upload thread plus the parallel parts of large files;
+        # bursts beyond that open extra connections instead of waiting, and a dead endpoint fails fast.
+        # urllib3 does not retry: upload_file_to_minio's loop owns the retry policy
+        http_client = urllib3.PoolManager(
+            timeout=urllib3.Timeout(connect=5, read=60),
+            maxsize=max(32, MINIO_UPLOAD_CONCURRENCY),
+            block=False,
+            cert_reqs="CERT_REQUIRED",
+            ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+            retries=False
+        )
         client = Minio(
             os.getenv("MINIO_ENDPOINT"),
             access_key=os.getenv("MINIO_ACCESS_KEY"),
             secret_key=os.getenv("MINIO_SECRET_KEY"),
             secure=os.getenv("MINIO_SECURE", "False").lower() in ("true", "1", "t"),
+            http_client=http_client
         )
         logging.info(f"Successfully connected to MinIO at {os.getenv('MINIO_ENDPOINT')}")
         return client
@@ -173,34 +265,141 @@ def get_minio_client():
         logging.error(f"Failed to initialize MinIO client: {str(e)}")
         raise
 
+def get_minio_client():
+    """Get the process-wide MinIO client, whose keep-alive pool is shared by all uploads"""
+    global _minio_client
+    # Checked again under the lock so threads racing on the first call still build one client
+    if _minio_client is None:
+        with _minio_client_lock:
+            if _minio_client is None:
+                _minio_client = create_minio_client()
+    return _minio_client
+
+@functools.lru_cache(maxsize=None)
 def sanitize_name(name):
     """
     Sanitize a string to be used as a valid S3 object prefix or bucket name.
-    """
-    # Convert to lowercase
-    name = name.lower()
 
-    # Replace underscores and spaces with hyphens
-    name = name.replace("_", "-").replace(" ", "-")
+    Names longer than one character keep a trailing 'z' (see the end check below):
+
+    >>> sanitize_name("Machine_One")
+    'machine-onez'
+    >>> sanitize_name("a")
+    'a'
+    """
+    # Lowercase and replace underscores and spaces with hyphens
+    name = name.lower().translate(_NAME_SEPARATORS)
 
     # Remove any invalid characters (only allow a-z, 0-9, . and -)
-    name = re.sub(r"[^a-z0-9.-]", "", name)
+    name = _INVALID_NAME_CHARS_RE.sub("", name)
 
     # Replace consecutive hyphens or dots with a single one
-    name = re.sub(r"[-]+", "-", name)
-    name = re.sub(r"[.]+", ".", name)
+    name = _REPEATED_HYPHENS_RE.sub("-", name)
+    name = _REPEATED_DOTS_RE.sub(".", name)
 
     # Remove leading and trailing hyphens and dots
     name = name.strip(".-")
 
     # Ensure it starts and ends with a letter or number
-    if len(name) > 0 and not re.match(r"^[a-z0-9]", name):
+    if len(name) > 0 and not name[:1].isalnum():
         name = "a" + name
-    if len(name) > 0 and not re.match(r"[a-z0-9]$", name):
+    # Existing object prefixes depend on this check, which only matches one-character names
+    if len(name) > 0 and not _NAME_END_RE.match(name):
         name = name + "z"
 
     return name
 
+@functools.lru_cache(maxsize=1)
+def minio_mc_bin():
+    """Return MC_BIN if it is the MinIO client (not, say, Midnight Commander), otherwise None."""
+    if not MC_BIN:
+        return None
+    try:
+        result = subprocess.run(
+            [MC_BIN, "--version"], capture_output=True, text=True, stdin=subprocess.DEVNULL, timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return MC_BIN if "minio" in (result.stdout + result.stderr).lower() else None
+
+def mirror_to_minio(output_path, machine_prefix):
+    """Mirror a machine's output directory to MinIO with mc. Returns True on success."""
+    # mc reads the alias from MC_HOST_<alias>, which keeps the credentials out of the command line
+    scheme = "https" if os.getenv("MINIO_SECURE", "False").lower() in ("true", "1", "t") else "http"
+    access_key = quote(os.getenv("MINIO_ACCESS_KEY", ""), safe="")
+    secret_key = quote(os.getenv("MINIO_SECRET_KEY", ""), safe="")
+    env = os.environ.copy()
+    env[f"MC_HOST_{MC_ALIAS}"] = f"{scheme}://{access_key}:{secret_key}@{os.getenv('MINIO_ENDPOINT')}"
+    try:
+        result = run_command(
+            [MC_BIN, "mirror", "--quiet", "--overwrite", "--max-workers", str(MINIO_UPLOAD_CONCURRENCY),
+             output_path, f"{MC_ALIAS}/{MINIO_BUCKET_NAME}/{machine_prefix}/"],
+            check=False, env=env
+        )
+    except Exception:
+        return False
+    return result.returncode == 0
+
+def upload_file_to_minio(client, file_path, minio_path, size):
+    """Upload a single file of the given size to MinIO, retrying transient failures. Returns (success, error message)."""
+    file = os.path.basename(file_path)
+    if size > LARGE_OBJECT_THRESHOLD:
+        options = {"part_size": MULTIPART_PART_SIZE, "num_parallel_uploads": MULTIPART_PARALLEL_UPLOADS}
+    else:
+        options = {}
+    for attempt in range(MINIO_UPLOAD_ATTEMPTS):
+        try:
+            client.fput_object(MINIO_BUCKET_NAME, minio_path, file_path, **options)
+            return True, None
+        except Exception as e:
+            permanent = isinstance(e, S3Error) and e.code not in RETRYABLE_S3_CODES
+            if permanent or attempt == MINIO_UPLOAD_ATTEMPTS - 1:
+                # Don't log here as the caller reports the failure
+                return False, str(e)
+            logging.warning(f"Retry {attempt+1}/{MINIO_UPLOAD_ATTEMPTS} for {file}: {str(e)}")
+            time.sleep(MINIO_RETRY_BASE_DELAY * 2 ** attempt + random.uniform(0, MINIO_RETRY_BASE_DELAY))
+
+def scan_output_dirs(root):
+    """
+    Yield (directory, {file name: size}, [(path, error)]) for root and every directory below it.
+    Like os.walk, symlinked directories are not descended into; sizes come from scandir's entries.
+    Entries that cannot be read (broken symlinks, files or directories that vanished) are
+    returned in the error list instead of aborting the scan.
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        sizes = {}
+        errors = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir():
+                            if not entry.is_symlink():
+                                stack.append(entry.path)
+                        else:
+                            sizes[entry.name] = entry.stat().st_size
+                    except OSError as e:
+                        errors.append((entry.path, str(e)))
+        except OSError as e:
+            errors.append((directory, str(e)))
+        yield directory, sizes, errors
+
+def upload_batch_to_minio(client, dir_path, file_names, minio_path):
+    """Pack small files from one directory into a tar.zst and upload it. Returns (success, error message)."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        archive_path = os.path.join(tmp_dir, SMALL_FILE_BATCH_NAME)
+        try:
+            with open(archive_path, "wb") as raw, \
+                    zstandard.ZstdCompressor().stream_writer(raw) as compressed, \
+                    tarfile.open(fileobj=compressed, mode="w|") as tar:
+                for file_name in file_names:
+                    tar.add(os.path.join(dir_path, file_name), arcname=file_name)
+        except Exception as e:
+            return False, f"could not pack {dir_path}: {str(e)}"
+        return upload_file_to_minio(client, archive_path, minio_path, os.path.getsize(archive_path))
+
 def upload_to_minio(machine_name, base_output_dir_str="./output"):
     """Upload machine's output (from base_output_dir) to MinIO with error handling."""
     try:
@@ -224,20 +423,56 @@ def upload_to_minio(machine_name, base_output_dir_str="./output"):
         logging.info(f"Using prefix '{machine_prefix}' for machine '{machine_name}'")
 
         # Check if the bucket exists, create if not
+        # (only the first upload asks the server, later ones reuse the answer)
         try:
-            if not client.bucket_exists(MINIO_BUCKET_NAME):
-                client.make_bucket(MINIO_BUCKET_NAME)
-                logging.info(f"Created bucket: {MINIO_BUCKET_NAME}")
-            else:
-                logging.info(f"Using existing bucket: {MINIO_BUCKET_NAME}")
+            with _bucket_lock:
+                if MINIO_BUCKET_NAME not in _ready_buckets:
+                    if not client.bucket_exists(MINIO_BUCKET_NAME):
+                        client.make_bucket(MINIO_BUCKET_NAME)
+                        logging.info(f"Created bucket: {MINIO_BUCKET_NAME}")
+                    else:
+                        logging.info(f"Using existing bucket: {MINIO_BUCKET_NAME}")
+                    _ready_buckets.add(MINIO_BUCKET_NAME)
         except Exception as e:
             error_msg = f"Error checking/creating MinIO bucket: {str(e)}"
             logging.error(error_msg)
             print_error(error_msg)
             return False
 
-        # Count files for progress tracking
-        total_files = sum(len(files) for _, _, files in os.walk(output_path))
+        # mc reuses connections and uploads in parallel natively, so prefer it when installed
+        if not BATCH_SMALL_FILES and minio_mc_bin():
+            if mirror_to_minio(output_path, machine_prefix):
+                logging.info(f"Mirrored {output_path} to {MINIO_BUCKET_NAME}/{machine_prefix} with mc")
+                print_success(f"Mirrored {machine_name} to MinIO with mc")
+                return True
+            warning_msg = f"mc mirror failed for {machine_name}, falling back to per-file upload."
+            logging.warning(warning_msg)
+            print_warning(warning_msg)
+
+        # Collect the files to upload in a single walk, with their sizes and object keys.
+        # Batched directories become one entry whose last field lists the packed file names.
+        uploads = []
+        unreadable = []
+        for root, sizes, errors in scan_output_dirs(output_path):
+            unreadable.extend(errors)
+            # Create MinIO paths with machine prefix; the relative path is computed once per directory
+            rel_dir = os.path.relpath(root, output_path)
+            key_prefix = machine_prefix if rel_dir == "." else f"{machine_prefix}/{rel_dir.replace(os.sep, '/')}"
+            files = list(sizes)
+            small_files = [file for file in files if sizes[file] <= SMALL_FILE_MAX_SIZE]
+            if (BATCH_SMALL_FILES and len(small_files) > SMALL_FILE_BATCH_MIN_FILES
+                    and sum(sizes[file] for file in small_files) < SMALL_FILE_BATCH_MAX_BYTES):
+                batch_path = os.path.join(root, SMALL_FILE_BATCH_NAME)
+                uploads.append((batch_path, sum(sizes[file] for file in small_files), f"{key_prefix}/{SMALL_FILE_BATCH_NAME}", small_files))
+                files = [file for file in files if sizes[file] > SMALL_FILE_MAX_SIZE]
+            for file in files:
+                uploads.append((os.path.join(root, file), sizes[file], f"{key_prefix}/{file}", None))
+
+        # Start the largest files first so they overlap with the many small ones
+        uploads.sort(key=lambda upload: upload[1], reverse=True)
+
+        # Unreadable entries count as failed uploads, as they would have failed to upload
+        total_files = len(uploads) + len(unreadable)
         if total_files == 0:
             warning_msg = f"No files found in {output_path} to upload for {machine_name}."
             logging.warning(warning_msg)
@@ -248,45 +483,41 @@ def upload_to_minio(machine_name, base_output_dir_str="./output"):
         print_step(f"Found {total_files} files to upload for {machine_name}")
 
         upload_count = 0
-        file_count = 0
-        error_count = 0
-
-        # Upload files recursively with error handling
-        for root, dirs, files in os.walk(output_path):
-            # Process files first
-            for file in sorted(files):
+        file_count = len(unreadable)
+        error_count = len(unreadable)
+        for path, error in unreadable:
+            logging.error(f"Failed to upload {os.path.basename(path)}: could not read {path}: {error}")
+
+        # Report progress about every 1% of the files (at least every 10), and print every fifth report
+        log_interval = max(10, total_files // 100)
+        print_interval = log_interval * 5
+
+        # Upload the files concurrently; each PUT is a network round trip, so threads overlap them
+        with ThreadPoolExecutor(max_workers=MINIO_UPLOAD_CONCURRENCY) as executor:
+            futures = {
+                (executor.submit(upload_batch_to_minio, client, os.path.dirname(file_path), batched, minio_path) if batched
+                 else executor.submit(upload_file_to_minio, client, file_path, minio_path, size)): file_path
+                for file_path, size, minio_path, batched in uploads
+            }
+            for future in as_completed(futures):
                 file_count += 1
-                file_path = os.path.join(root, file)
-                rel_path = os.path.relpath(file_path, output_path)
-                # Create MinIO path with machine prefix
-                minio_path = f"{machine_prefix}/{rel_path.replace('\\', '/')}"
-
-                try:
-                    # Show progress periodically
-                    if file_count % 10 == 0 or file_count == 1 or file_count == total_files:
-                        progress_msg = f"Uploading file {file_count}/{total_files} ({file_count/total_files*100:.1f}%): {file}"
-                        logging.info(progress_msg)
-                        if file_count % 50 == 0 or file_count == 1 or file_count == total_files:
-                            print_step(progress_msg)
-
-                    # Upload the file with retry on failure
-                    for attempt in range(3):  # Try up to 3 times
-                        try:
-                            client.fput_object(MINIO_BUCKET_NAME, minio_path, file_path)
-                            upload_count += 1
-                            break
-                        except Exception as e:
-                            if attempt < 2:  # Don't log on the last attempt as we'll log after the loop
-                                logging.warning(f"Retry {attempt+1}/3 for {file}: {str(e)}")
-                                time.sleep(1)  # Small delay before retry
-                            else:
-                                raise
-                except Exception as e:
-                    error_msg = f"Failed to upload {file}: {str(e)}"
+                file = os.path.basename(futures[future])
+                success, error = future.result()
+                if success:
+                    upload_count += 1
+                else:
+                    error_msg = f"Failed to upload {file}: {error}"
                     logging.error(error_msg)
                     error_count += 1
                     # Continue with other files
 
+                # Show progress periodically
+                if file_count % log_interval == 0 or file_count == 1 or file_count == total_files:
+                    progress_msg = f"Uploaded file {file_count}/{total_files} ({file_count/total_files*100:.1f}%): {file}"
+                    logging.info(progress_msg)
+                    if file_count % print_interval == 0 or file_count == 1 or file_count == total_files:
+                        print_step(progress_msg)
+
         # Final report
         if upload_count > 0:
             success_rate = (upload_count / total_files) * 100 if total_files > 0 else 0
@@ -317,6 +548,35 @@ def upload_to_minio(machine_name, base_output_dir_str="./output"):
         traceback.print_exc()
         return False
 
+def fast_rmtree(path):
+    """Delete a directory tree with rm -rf where available, else shutil.rmtree. Raises OSError on failure."""
+    if not RM_BIN:
+        shutil.rmtree(path)
+        return
+    result = subprocess.run([RM_BIN, "-rf", "--", str(path)], stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        raise OSError(f"rm -rf {path} failed with code {result.returncode}: {result.stderr.strip()}")
+
+def find_required_files_dirs(root):
+    """Yield the 'required_files' directories under root, using scandir's entry types instead of stat calls."""
+    with os.scandir(root) as entries:
+        subdirs = [entry for entry in entries if entry.is_dir(follow_symlinks=False)]
+    for entry in subdirs:
+        if entry.name == "required_files":
+            yield entry.path
+        else:
+            yield from find_required_files_dirs(entry.path)
+
+def remove_required_files_dir(path):
+    """Delete one 'required_files' directory. Returns True if it was removed."""
+    try:
+        fast_rmtree(path)
+        logging.info(f"Removed directory: {path}")
+        return True
+    except Exception as e:
+        print_warning(f"Could not remove {path}: {str(e)}")
+        return False
+
 def cleanup_directories(base_source_dir_str="./machines", base_output_dir_str="./output"):
     """Clean up output directories and previously processed data in source dirs"""
     print_section("Cleaning Up Previous Data")
@@ -328,22 +588,16 @@ def cleanup_directories(base_source_dir_str="./machines", base_output_dir_str=".
         # Clean output directory
         if output_dir.exists():
             print_step(f"Removing existing output directory: {output_dir}...")
-            shutil.rmtree(output_dir)
+            fast_rmtree(output_dir)
         os.makedirs(output_dir, exist_ok=True)
         print_success(f"Cleaned and recreated output directory: {output_dir}")
         
         # Clean required_files directories in machine folders
         if source_dir.is_dir():
             print_step(f"Removing existing 'required_files' directories within {source_dir}...")
-            count = 0
-            for item in source_dir.glob("**/required_files"): # Recursive search
-                if item.is_dir():
-                    try:
-                        shutil.rmtree(item)
-                        logging.info(f"Removed directory: {item}")
-                        count += 1
-                    except Exception as e:
-                        print_warning(f"Could not remove {item}: {str(e)}")
+            # The machine directories are independent, so remove them concurrently
+            with ThreadPoolExecutor(max_workers=CLEANUP_WORKERS) as executor:
+                count = sum(executor.map(remove_required_files_dir, find_required_files_dirs(source_dir)))
             print_success(f"Removed {count} 'required_files' directories.")
         else:
             print_warning(f"Source directory {source_dir} not found, skipping required_files cleanup.")
@@ -360,6 +614,53 @@ def cleanup_directories(base_source_dir_str="./machines", base_output_dir_str=".
 # Removed run_master_process() function as it's no longer called from here.
 # def run_master_process(): ...
 
+def prepare_and_extract_machine(machine_name, base_source_dir, base_output_dir):
+    """Prepare and extract one machine. Returns True if its output is ready to upload."""
+    machine_path = Path(base_source_dir) / machine_name
+    print_section(f"Processing {machine_name} - Prep & Extract")
+
+    # Prepare the machine using shared function
+    print_step(f"Preparing {machine_name}...")
+    prep_success = shared_prepare_machine(str(machine_path))
+
+    if not prep_success:
+        print_warning(f"Preparation failed for {machine_name}. Skipping extraction.")
+        return False
+    print_success(f"Preparation successful for {machine_name}.")
+
+    # Run log extraction using shared function
+    print_step(f"Running log extraction for {machine_name}...")
+    extract_success = shared_run_log_extraction(machine_name, base_source_dir, base_output_dir)
+
+    if not extract_success:
+        print_warning(f"Log extraction failed for {machine_name}.")
+        return False
+    print_success(f"Log extraction successful for {machine_name}.")
+    return True
+
+def extract_and_queue_machine(machine_name, base_source_dir, base_output_dir, upload_queue):
+    """
+    Prepare and extract one machine, then queue it for upload. Blocks while the upload
+    queue is full, so extraction does not run ahead of the uploader. Returns False on failure.
+    """
+    if not prepare_and_extract_machine(machine_name, base_source_dir, base_output_dir):
+        return False
+    upload_queue.put(machine_name)
+    return True
+
+def upload_worker(upload_queue, base_output_dir, failures):
+    """Upload machines from the queue until a None sentinel arrives, recording failed uploads."""
+    while True:
+        machine_name = upload_queue.get()
+        if machine_name is None:
+            break
+        print_step(f"Uploading logs for {machine_name} to MinIO...")
+        if upload_to_minio(machine_name, base_output_dir):
+            print_success(f"MinIO upload successful for {machine_name}.")
+        else:
+            print_warning(f"MinIO upload failed for {machine_name}.")
+            failures.append(f"{machine_name} (upload)")
+
 def main():
     """Main function to run Prep, Extract, and Upload steps."""
     start_time = time.time()
@@ -401,42 +702,31 @@ def main():
             print_step(f"Found {len(machines)} machines to process: {   ',  '.join(sorted(machines))}")
             
             prep_extract_failures = []
-            for machine_name in sorted(machines):
-                machine_path = base_source_dir / machine_name
-                print_section(f"Processing {machine_name} - Prep, Extract & Upload")
-                
-                # Prepare the machine using shared function
-                print_step(f"Preparing {machine_name}...")
-                prep_success = shared_prepare_machine(str(machine_path))
-                
-                if not prep_success:
-                    print_warning(f"Preparation failed for {machine_name}. Skipping extraction.")
-                    prep_extract_failures.append(machine_name)
-                    continue # Skip to next machine
-                else:
-                    print_success(f"Preparation successful for {machine_name}.")
-                    
-                # Run log extraction using shared function
-                print_step(f"Running log extraction for {machine_name}...")
-                extract_success = shared_run_log_extraction(machine_name, str(base_source_dir), str(base_output_dir))
-                
-                if not extract_success:
-                    print_warning(f"Log extraction failed for {machine_name}.")
-                    prep_extract_failures.append(machine_name)
-                    # Continue to next machine
-                else:
-                    print_success(f"Log extraction successful for {machine_name}.")
-                    
-                    # Step 3: Upload to MinIO
-                    print_step(f"Uploading logs for {machine_name} to MinIO...")
-                    upload_success = upload_to_minio(machine_name, str(base_output_dir))
-                    
-                    if not upload_success:
-                        print_warning(f"MinIO upload failed for {machine_name}.")
-                        prep_extract_failures.append(f"{machine_name} (upload)")
-                        # Continue to next machine
-                    else:
-                        print_success(f"MinIO upload successful for {machine_name}.")
+            # Machines are independent and their heavy steps run in subprocesses or on the network,
+            # so process them concurrently; wall time approaches the slowest machine rather than the sum
+            # Uploads run on their own thread, so a machine's upload overlaps the next machine's extraction
+            max_workers = min(len(machines), MACHINE_WORKERS)
+            upload_queue = queue.Queue(maxsize=UPLOAD_QUEUE_SIZE)
+            upload_failures = []
+            upload_thread = threading.Thread(
+                target=upload_worker, args=(upload_queue, str(base_output_dir), upload_failures)
+            )
+            upload_thread.start()
+            try:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = {
+                        executor.submit(extract_and_queue_machine, machine_name, str(base_source_dir), str(base_output_dir), upload_queue): machine_name
+                        for machine_name in sorted(machines)
+                    }
+                    for future in as_completed(futures):
+                        if not future.result():
+                            prep_extract_failures.append(futures[future])
+            finally:
+                upload_queue.put(None)
+                upload_thread.join()
+
+            # Completion order varies between runs, so sort the report by machine
+            prep_extract_failures = sorted(prep_extract_failures + upload_failures)
 
             if prep_extract_failures:
                 print_warning(f"Preparation or extraction failed for: {', '.join(prep_extract_failures)}")
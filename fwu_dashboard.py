@@ -1,12 +1,13 @@
 import os
 import random
+import functools
 import pandas as pd
 from pymongo import MongoClient
 from bson import ObjectId
 from urllib.parse import quote_plus
 from dotenv import load_dotenv
 import gradio as gr
-import plotly.express as px
+import plotly.graph_objects as go
 
 load_dotenv()
 
@@ -22,9 +23,18 @@ client = MongoClient(uri)
 db = client[db_name]
 collections_list = db.list_collection_names()
 
+# Sections of a task document shown on the detail page
+DETAIL_PROJECTION = {"OneView": 1, "Server": 1, "Firmware Update": 1, "Install set Response": 1, "Components": 1}
+
 # Fetch and parse DB content
 def fetch_all_tasks(collection_name):
-    return list(db[collection_name].find())
+    # Only the task list columns are needed, so let the server project them and count components
+    return list(db[collection_name].aggregate([
+        {"$project": {
+            "task_id": "$Server.Task ID",
+            "component_count": {"$cond": [{"$isArray": "$Components"}, {"$size": "$Components"}, 0]}
+        }}
+    ]))
 
 def build_summary(num_failures):
     successes = random.randint(num_failures + 1, num_failures + 10)
@@ -37,15 +47,21 @@ def build_summary(num_failures):
 def dict_to_df(d):
     if not d:
         return pd.DataFrame(columns=["Key", "Value"])
-    return pd.DataFrame(list(d.items()), columns=["Key", "Value"])
+    return pd.DataFrame({"Key": list(d.keys()), "Value": list(d.values())})
+
+# Cached so toggling between tasks does not go back to MongoDB; cleared whenever data is (re)loaded
+@functools.lru_cache(maxsize=512)
+def fetch_task_doc(collection_name, task_id):
+    return db[collection_name].find_one({"_id": ObjectId(task_id)}, DETAIL_PROJECTION)
 
 def show_task_details(collection_name, task_id):
-    doc = db[collection_name].find_one({"_id": ObjectId(task_id)})
+    doc = fetch_task_doc(collection_name, task_id)
     if not doc:
         return pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
-    components = pd.DataFrame(doc.get("Components", []))
-    if "deviceClass" in components.columns:
-        components = components.drop(columns=["deviceClass"])
+    components = doc.get("Components") or []
+    # Leave deviceClass out while building the frame; from_records raises if an excluded column is absent
+    exclude = ["deviceClass"] if any("deviceClass" in component for component in components) else None
+    components = pd.DataFrame.from_records(components, exclude=exclude)
     return (
         dict_to_df(doc.get("OneView", {})),
         dict_to_df(doc.get("Server", {})),
@@ -55,8 +71,15 @@ def show_task_details(collection_name, task_id):
     )
 
 def make_pie_chart(successes, failures):
-    df = pd.DataFrame({"Status": ["Succeeded", "Failed"], "Count": [successes, failures]})
-    return px.pie(df, names="Status", values="Count", title="Task Status Distribution")
+    # Build the trace directly; plotly.express would go through a throwaway DataFrame
+    return go.Figure(
+        data=[go.Pie(
+            labels=["Succeeded", "Failed"],
+            values=[successes, failures],
+            hovertemplate="Status=%{label}<br>Count=%{value}<extra></extra>"
+        )],
+        layout={"title": {"text": "Task Status Distribution"}}
+    )
 
 # Gradio UI
 dashboard = gr.Blocks(theme=gr.themes.Soft())
@@ -92,12 +115,13 @@ with dashboard:
     state_successes = gr.State()
 
     def on_load(collection_name):
+        fetch_task_doc.cache_clear()
         tasks = fetch_all_tasks(collection_name)
         failed_df = pd.DataFrame([
             {
                 "_id": str(task["_id"]),
-                "Task": task.get("Server", {}).get("Task ID", "N/A"),
-                "Component Count": len(task.get("Components", []))
+                "Task": task.get("task_id", "N/A"),
+                "Component Count": task["component_count"]
             } for task in tasks
         ])
         summary, successes = build_summary(len(failed_df))
@@ -6,22 +6,29 @@
 
 import os
 import sys
-import subprocess
 import logging
+import logging.handlers
+import queue
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dotenv import load_dotenv
-from pathlib import Path
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("master_processing.log"), # Use a different log file
-        logging.StreamHandler(),
-    ],
-)
+
+import orchestrator
+
+# Configure logging. Records go onto a queue and a background QueueListener writes them to the
+# file and console, so concurrent machine analyses don't wait on each other's log writes.
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+log_queue = queue.Queue(-1)
+log_handlers = [
+    logging.FileHandler("master_processing.log"), # Use a different log file
+    logging.StreamHandler(),
+]
+for handler in log_handlers:
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+log_listener = logging.handlers.QueueListener(log_queue, *log_handlers)
+logging.getLogger().setLevel(logging.INFO)
+logging.getLogger().addHandler(logging.handlers.QueueHandler(log_queue))
 
 # Load env variables for MongoDB
 load_dotenv()
@@ -29,53 +36,28 @@ load_dotenv()
 # Set your source base directory (with multiple machine folders)
 BASE_OUTPUT_DIR = "./output" # Directory where log files reside
 
+# Number of machines analyzed at the same time. Kept small by default because each
+# machine's 2.py runs its own process pool
+MACHINE_WORKERS = int(os.getenv("MACHINE_WORKERS", 2))
+# 2.py reads this to give each concurrent analysis an equal share of the cores
+os.environ["MACHINE_WORKERS"] = str(MACHINE_WORKERS)
+
 
 def run_log_analysis(machine_name):
-    """Run analysis script (2.py via orchestrator.py) with environment variables"""
+    """Run the analysis (2.py via the orchestrator) for one machine"""
     try:
         logging.info(f"Starting log analysis for {machine_name}")
 
-        # Set up environment with variables for the analysis
-        env = os.environ.copy()
-        env["MONGO_COLLECTION"] = machine_name
-
         logging.info(
             f"Running analysis with MONGO_COLLECTION={machine_name}"
         )
 
-        # Run the analysis script (ensure orchestrator.py exists)
-        analysis_script = Path("orchestrator.py")
-        if not analysis_script.exists():
-            logging.error(f"Analysis script     '{analysis_script}  ' not found.")
-            return False
-            
-        result = subprocess.run(
-            [sys.executable, str(analysis_script)], # Use sys.executable
-            env=env,
-            capture_output=True,
-            text=True,
-            check=False # Check return code manually
-        )
-
-        # Log output
-        if result.stdout:
-            for line in result.stdout.strip().split(    '\n '):
-                if line:
-                    logging.info(f"Analysis output: {line}")
-        if result.stderr:
-            for line in result.stderr.strip().split(    '\n '):
-                if line:
-                    log_level = logging.ERROR if result.returncode != 0 else logging.WARNING
-                    logging.log(log_level, f"Analysis error: {line}")
-
-        # Check for success and log output
-        if result.returncode == 0:
+        # The orchestrator runs in this process and logs through this module's handlers
+        if orchestrator.run(machine_name):
             logging.info(f"Log analysis completed successfully for {machine_name}")
             return True
         else:
-            logging.error(
-                f"Log analysis failed for {machine_name} with return code {result.returncode}"
-            )
+            logging.error(f"Log analysis failed for {machine_name}")
             return False
 
     except Exception as e:
@@ -143,16 +125,13 @@ def main():
 
         # Get all machine directories from the OUTPUT directory
         try:
-            output_dir_path = Path(BASE_OUTPUT_DIR)
-            if not output_dir_path.is_dir():
+            if not os.path.isdir(BASE_OUTPUT_DIR):
                 logging.error(f"Base output directory '{BASE_OUTPUT_DIR}' not found. Nothing to process.")
                 return 1
                 
-            machine_dirs = [
-                d.name
-                for d in output_dir_path.iterdir()
-                if d.is_dir()
-            ]
+            # scandir entries know their type from the directory listing, so no stat per entry
+            with os.scandir(BASE_OUTPUT_DIR) as entries:
+                machine_dirs = [entry.name for entry in entries if entry.is_dir()]
             if not machine_dirs:
                 logging.error(f"No machine directories found in {BASE_OUTPUT_DIR}")
                 return 1
@@ -168,24 +147,29 @@ def main():
         successful = []
         failed = []
 
-        for i, machine_name in enumerate(sorted(machine_dirs), 1):
+        def analyze_machine(i, machine_name):
             logging.info(
                 f"\nAnalyzing machine {i}/{len(machine_dirs)}: {machine_name}"
             )
-            # Verify machine directory exists
-            machine_path = os.path.join(BASE_OUTPUT_DIR, machine_name)
-            if not os.path.isdir(machine_path):
-                logging.error(f"Machine directory {machine_path} not found or is not a directory")
-                failed.append(machine_name)
-                continue
-
-            if process_machine(machine_name):
-                successful.append(machine_name)
-            else:
-                failed.append(machine_name)
-                logging.warning(
-                    f"Failed to analyze {machine_name}, continuing with next machine"
-                )
+            # The listing above already established this is a directory
+            return process_machine(machine_name)
+
+        # The heavy work of each analysis runs in 2.py subprocesses, so threads are enough to run
+        # machines side by side; results are read in submission order to keep the summary sorted
+        sorted_machines = sorted(machine_dirs)
+        with ThreadPoolExecutor(max_workers=min(len(machine_dirs), MACHINE_WORKERS)) as executor:
+            futures = [
+                executor.submit(analyze_machine, i, machine_name)
+                for i, machine_name in enumerate(sorted_machines, 1)
+            ]
+            for machine_name, future in zip(sorted_machines, futures):
+                if future.result():
+                    successful.append(machine_name)
+                else:
+                    failed.append(machine_name)
+                    logging.warning(
+                        f"Failed to analyze {machine_name}, continuing with next machine"
+                    )
 
         # Final summary
         end_time = datetime.now()
@@ -217,7 +201,12 @@ def main():
         return 1
 
 if __name__ == "__main__":
-    exit_code = main()
+    log_listener.start()
+    try:
+        exit_code = main()
+    finally:
+        # Drains the queue before returning
+        log_listener.stop()
     sys.exit(exit_code)
 
 
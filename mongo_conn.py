@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# === mongo_conn.py ===
+# Shared MongoDB connection settings, so every script that talks to MongoDB
+# builds the same URI and uses the same connection pool configuration.
+
+import os
+import functools
+from urllib.parse import quote_plus
+from pymongo import MongoClient
+
+# Connections kept open per client, enough for the concurrent analysis workers
+MONGO_MAX_POOL_SIZE = max((os.cpu_count() or 1) * 2, 20)
+
+
+def build_mongo_uri():
+    """Build the MongoDB URI from MONGO_USER, MONGO_PASS, MONGO_HOST and MONGO_PORT"""
+    mongo_user = quote_plus(os.getenv("MONGO_USER"))
+    mongo_pass = quote_plus(os.getenv("MONGO_PASS"))
+    mongo_host = os.getenv("MONGO_HOST", "localhost")
+    mongo_port = os.getenv("MONGO_PORT", "27017")
+    return f"mongodb://{mongo_user}:{mongo_pass}@{mongo_host}:{mongo_port}/"
+
+
+@functools.lru_cache(maxsize=None)
+def get_mongo_client(mongo_uri):
+    """Return the process-wide MongoClient for mongo_uri, reusing its connection pool."""
+    return MongoClient(
+        mongo_uri,
+        serverSelectionTimeoutMS=5000,
+        maxPoolSize=MONGO_MAX_POOL_SIZE,
+        compressors="zstd,zlib"
+    )
@@ -126,16 +126,17 @@ def copy_serverlogs(serverlogs_info, target_serverlogs_dir):
     if serverlogs_info['dir']:
         try:
             # Copy everything in the serverlogs directory to the target
-            for item in os.listdir(serverlogs_info['dir']):
-                source_item = os.path.join(serverlogs_info['dir'], item)
-                target_item = os.path.join(target_serverlogs_dir, item)
-                
-                if os.path.isdir(source_item):
-                    shutil.copytree(source_item, target_item, dirs_exist_ok=True)
-                    print(f"Copied directory {item} to {target_serverlogs_dir}")
-                else:
-                    shutil.copy2(source_item, target_item)
-                    print(f"Copied file {item} to {target_serverlogs_dir}")
+            # (scandir entries answer is_dir() without an extra stat per item)
+            with os.scandir(serverlogs_info['dir']) as entries:
+                for entry in entries:
+                    target_item = os.path.join(target_serverlogs_dir, entry.name)
+                    
+                    if entry.is_dir():
+                        shutil.copytree(entry.path, target_item, dirs_exist_ok=True)
+                        print(f"Copied directory {entry.name} to {target_serverlogs_dir}")
+                    else:
+                        shutil.copy2(entry.path, target_item)
+                        print(f"Copied file {entry.name} to {target_serverlogs_dir}")
             
             return True
         except Exception as e: